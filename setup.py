@@ -40,6 +40,9 @@ setup(
             "flake8>=3.8",
             "mypy>=0.800",
         ],
+        "cache": [
+            "pyarrow>=7.0",
+        ],
     },
     entry_points={
         "console_scripts": [
@@ -0,0 +1,46 @@
+import sys
+import resource
+import multiprocessing
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import numpy as np
+import pandas as pd
+
+from data_science_toolkit.data_utils import DataProcessor
+
+
+def _peak_rss_mb() -> float:
+    # ru_maxrss jest w KiB na Linuksie
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _measure(rows: int, columns: int, copy: bool, queue) -> None:
+    # copy=False, żeby budowa ramki nie podniosła szczytu RSS przed pomiarem
+    df = pd.DataFrame(np.random.default_rng(0).random((rows, columns)), copy=False)
+    baseline = _peak_rss_mb()
+
+    result = DataProcessor().load_and_validate(df, copy=copy)
+    queue.put((baseline, _peak_rss_mb(), result.shape))
+
+
+def run(rows: int = 2_000_000, columns: int = 50) -> None:
+    size_mb = rows * columns * 8 / 1024 ** 2
+    print(f"Ramka {rows} x {columns} float64 ({size_mb:.0f} MB)")
+    print(f"{'copy':>6} | {'RSS przed [MB]':>15} | {'RSS szczyt [MB]':>15} | {'przyrost [MB]':>13}")
+
+    ctx = multiprocessing.get_context('spawn')
+    for copy in (True, False):
+        queue = ctx.Queue()
+        process = ctx.Process(target=_measure, args=(rows, columns, copy, queue))
+        process.start()
+        baseline, peak, _ = queue.get()
+        process.join()
+        print(f"{str(copy):>6} | {baseline:>15.0f} | {peak:>15.0f} | {peak - baseline:>13.0f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,69 @@
+import sys
+import time
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from data_science_toolkit.math_tools import moving_average
+
+
+def _legacy_exponential(data: np.ndarray, window: int) -> np.ndarray:
+    alpha = 2.0 / (window + 1)
+    result = np.zeros(len(data))
+    result[0] = data[0]
+    for i in range(1, len(data)):
+        result[i] = alpha * data[i] + (1 - alpha) * result[i-1]
+    return result
+
+
+def _best_time(func, repeats: int = 3) -> float:
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_exponential(n: int = 1_000_000, window: int = 20) -> None:
+    data = np.random.default_rng(0).normal(size=n).cumsum()
+    
+    legacy = _best_time(lambda: _legacy_exponential(data, window), repeats=1)
+    vectorized = _best_time(lambda: moving_average(data, window, method='exponential'))
+    float32 = _best_time(lambda: moving_average(data.astype(np.float32), window, method='exponential'))
+    
+    np.testing.assert_allclose(moving_average(data, window, method='exponential'), _legacy_exponential(data, window))
+    
+    print(f"EMA, n={n}, okno={window}")
+    print(f"  pętla Pythona: {legacy * 1000:10.1f} ms")
+    print(f"  lfilter:       {vectorized * 1000:10.1f} ms  (x{legacy / vectorized:.0f})")
+    print(f"  lfilter f32:   {float32 * 1000:10.1f} ms")
+
+
+def bench_simple_backends(sizes=(10_000, 1_000_000), windows=(16, 128, 1024, 50_000)) -> None:
+    # Każdy backend wymuszony jawnie przez publiczne moving_average; 'auto' mierzony tak samo
+    backends = ('direct', 'cumsum', 'fft', 'auto')
+    print(f"{'n':>9} | {'okno':>6} | " + " | ".join(f"{backend + ' [ms]':>11}" for backend in backends))
+    rng = np.random.default_rng(0)
+    for n in sizes:
+        data = rng.normal(size=n).cumsum()
+        for window in windows:
+            if window > n:
+                continue
+            timings = {}
+            for backend in backends:
+                # Splot bezpośredni dla ogromnych n·w trwałby minuty
+                if backend == 'direct' and n * window > 2e8:
+                    timings[backend] = float('nan')
+                    continue
+                timings[backend] = _best_time(lambda: moving_average(data, window, backend=backend)) * 1000
+            print(f"{n:>9} | {window:>6} | " + " | ".join(f"{timings[backend]:>11.2f}" for backend in backends))
+
+if __name__ == '__main__':
+    bench_exponential()
+    print()
+    bench_simple_backends()
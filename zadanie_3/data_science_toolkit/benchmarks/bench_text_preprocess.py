@@ -0,0 +1,70 @@
+import os
+import re
+import string
+import sys
+import time
+import unicodedata
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+import numpy as np
+
+from data_science_toolkit.text_processing import TextAnalyzer
+
+
+def _legacy_preprocess(text: str, remove_punctuation: bool = True, remove_numbers: bool = False,
+                       to_lowercase: bool = True) -> str:
+    if not isinstance(text, str):
+        text = str(text)
+    text = unicodedata.normalize('NFKD', text)
+    if to_lowercase:
+        text = text.lower()
+    text = re.sub(r'\s+', ' ', text).strip()
+    if remove_punctuation:
+        text = text.translate(str.maketrans('', '', string.punctuation))
+    if remove_numbers:
+        text = re.sub(r'\d+', '', text)
+    text = re.sub(r'\s+', ' ', text).strip()
+    return text
+
+
+def _make_corpus(n_docs: int, words_per_doc: int = 40) -> list:
+    rng = np.random.default_rng(0)
+    vocabulary = np.array(['Analiza', 'danych', 'w', 'Pythonie,', 'jest', 'bardzo', 'przydatna!', 'Łódź',
+                           'żółć', '2024', 'wynik:', '3.14', '(test)', 'zażółcić', 'gęślą', 'jaźń.'])
+    words = rng.choice(vocabulary, size=(n_docs, words_per_doc))
+    return [' '.join(row) for row in words]
+
+
+def _throughput(func, n_docs: int) -> float:
+    start = time.perf_counter()
+    func()
+    return n_docs / (time.perf_counter() - start)
+
+
+def run(n_docs: int = 200_000) -> None:
+    corpus = _make_corpus(n_docs)
+    analyzer = TextAnalyzer()
+    n_jobs = os.cpu_count() or 1
+    
+    assert analyzer.preprocess_batch(corpus[:1000], remove_numbers=True) == \
+        [_legacy_preprocess(text, remove_numbers=True) for text in corpus[:1000]]
+    
+    print(f"Korpus: {n_docs} dokumentów, procesy: {n_jobs}")
+    print(f"{'wariant':>34} | {'dokumenty/s':>12}")
+    for remove_numbers in (False, True):
+        legacy = _throughput(lambda: [_legacy_preprocess(text, remove_numbers=remove_numbers) for text in corpus], n_docs)
+        serial = _throughput(lambda: analyzer.preprocess_batch(corpus, remove_numbers=remove_numbers), n_docs)
+        pooled = _throughput(lambda: analyzer.preprocess_batch(corpus, remove_numbers=remove_numbers,
+                                                               n_jobs=n_jobs, chunksize=5000), n_docs)
+        suffix = ', bez cyfr' if remove_numbers else ''
+        print(f"{'preprocess_text (stary)' + suffix:>34} | {legacy:>12.0f}")
+        print(f"{'preprocess_batch' + suffix:>34} | {serial:>12.0f}")
+        print(f"{'preprocess_batch, pula' + suffix:>34} | {pooled:>12.0f}")
+
+
+if __name__ == '__main__':
+    run()
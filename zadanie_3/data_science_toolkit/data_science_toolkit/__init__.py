@@ -2,18 +2,44 @@ __version__ = "1.0.0"
 __author__ = "Dominik"
 __email__ = "naworskidominik@gmail.com"
 
-from .data_utils import DataProcessor, load_csv_safe, normalize_data
-from .math_tools import StatisticalCalculator, advanced_mean, correlation_matrix
-from .text_processing import TextAnalyzer, clean_text, extract_keywords
+from .data_utils import (
+    DataProcessor, HashDeduplicator, CsvCache, load_csv_safe, load_csv_many, sniff_csv_format,
+    optimize_dtypes, normalize_data, Normalizer, MinMaxNormalizer, ZScoreNormalizer, RobustNormalizer,
+    get_normalizer
+)
+from .math_tools import (
+    StatisticalCalculator, StreamingStats, QuantileSketch, CalculationHistory, advanced_mean, correlation_matrix,
+    RollingMean, RollingEMA, RollingWeightedMean, RollingMedian, CorrelationAccumulator
+)
+from .text_processing import TextAnalyzer, CorpusIndex, clean_text, extract_keywords
 
 __all__ = [
     'DataProcessor',
+    'HashDeduplicator',
+    'CsvCache',
     'load_csv_safe', 
+    'load_csv_many',
+    'sniff_csv_format',
+    'optimize_dtypes',
     'normalize_data',
+    'Normalizer',
+    'MinMaxNormalizer',
+    'ZScoreNormalizer',
+    'RobustNormalizer',
+    'get_normalizer',
     'StatisticalCalculator',
+    'StreamingStats',
+    'CalculationHistory',
+    'QuantileSketch',
     'advanced_mean',
     'correlation_matrix',
+    'CorrelationAccumulator',
+    'RollingMean',
+    'RollingEMA',
+    'RollingWeightedMean',
+    'RollingMedian',
     'TextAnalyzer',
+    'CorpusIndex',
     'clean_text',
     'extract_keywords'
 ]
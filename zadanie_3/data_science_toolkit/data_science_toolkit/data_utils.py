@@ -1,36 +1,386 @@
 import pandas as pd
 import numpy as np
-from typing import Union, List, Dict, Any, Optional
+from typing import Union, List, Dict, Any, Optional, Iterator, Tuple, Callable
 import logging
+import os
+import re
+import csv
+import glob
+import codecs
+import json
+import time
+import shutil
+import hashlib
+import tempfile
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial, lru_cache
+
+from .math_tools import QuantileSketch
+
+try:
+    import pyarrow.feather as feather
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 logger = logging.getLogger(__name__)
 
+_DECIMAL_COMMA_RE = re.compile(r'(?<![\d,])\d+,\d+(?![\d,])')
+_DATE_LIKE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}([ T]\d{2}:\d{2}(:\d{2}(\.\d+)?)?)?')
+# format='ISO8601' istnieje od pandas 2.0; starsze wersje same rozpoznają daty ISO bez formatu
+_ISO8601_FORMAT = 'ISO8601' if int(pd.__version__.split('.')[0]) >= 2 else None
+
+
+class HashDeduplicator:
+    def __init__(self, subset: Optional[List[str]] = None, n_partitions: int = 64,
+                 max_memory_hashes: int = 10_000_000, spill_dir: Optional[str] = None):
+        if n_partitions <= 0 or n_partitions & (n_partitions - 1):
+            raise ValueError("Liczba partycji musi być potęgą dwójki")
+        
+        self.subset = subset
+        self.n_partitions = n_partitions
+        self.max_memory_hashes = max_memory_hashes
+        self.spill_dir = spill_dir
+        self.seen_count = 0
+        self._shift = np.uint64(64 - n_partitions.bit_length() + 1)
+        # Każda partycja to lista posortowanych serii (tablica, ścieżka pliku lub None), od największej
+        self._runs: List[List[Tuple[np.ndarray, Optional[str]]]] = [[] for _ in range(n_partitions)]
+        self._run_counter = 0
+        self._spill_path = None
+    
+    @property
+    def spilled(self) -> bool:
+        return self._spill_path is not None
+    
+    def fingerprint(self, df: pd.DataFrame) -> np.ndarray:
+        keys = df if self.subset is None else df[self.subset]
+        # read_csv wybiera typy osobno dla każdej porcji (jeden brak zmienia int na float64),
+        # a 1 i 1.0 mają różne skróty - klucze liczbowe sprowadzamy do float64
+        numeric = {col: np.float64 for col, dtype in keys.dtypes.items()
+                   if pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+                   and dtype != np.float64}
+        if numeric:
+            keys = keys.astype(numeric)
+        return pd.util.hash_pandas_object(keys, index=False).to_numpy(dtype=np.uint64)
+    
+    def filter(self, df: pd.DataFrame) -> pd.DataFrame:
+        hashes = self.fingerprint(df)
+        
+        _, first_idx = np.unique(hashes, return_index=True)
+        mask = np.zeros(len(hashes), dtype=bool)
+        mask[first_idx] = True
+        
+        part_ids = (hashes >> self._shift).astype(np.intp) if self.n_partitions > 1 else np.zeros(len(hashes), dtype=np.intp)
+        for part in np.unique(part_ids[mask]):
+            in_part = mask & (part_ids == part)
+            candidates = hashes[in_part]
+            
+            seen = np.zeros(len(candidates), dtype=bool)
+            for run, _ in self._runs[part]:
+                pos = np.searchsorted(run, candidates)
+                valid = pos < len(run)
+                seen[valid] |= run[pos[valid]] == candidates[valid]
+            
+            mask[np.flatnonzero(in_part)[seen]] = False
+            new_hashes = candidates[~seen]
+            if len(new_hashes):
+                self._append_run(part, np.sort(new_hashes))
+                self.seen_count += len(new_hashes)
+        
+        if not self.spilled and self.seen_count > self.max_memory_hashes:
+            self._spill()
+        
+        return df[mask]
+    
+    def close(self) -> None:
+        self._runs = [[] for _ in range(self.n_partitions)]
+        if self._spill_path is not None:
+            shutil.rmtree(self._spill_path, ignore_errors=True)
+            self._spill_path = None
+        self.seen_count = 0
+    
+    def _write_run(self, part: int, hashes: np.ndarray) -> Tuple[np.ndarray, str]:
+        # Pliki serii są tylko dopisywane - nigdy nie nadpisujemy pliku otwartego przez mmap
+        self._run_counter += 1
+        path = os.path.join(self._spill_path, f"part_{part:05d}_{self._run_counter:08d}.npy")
+        np.save(path, hashes)
+        return np.load(path, mmap_mode='r'), path
+    
+    def _append_run(self, part: int, hashes: np.ndarray) -> None:
+        runs = self._runs[part]
+        runs.append(self._write_run(part, hashes) if self.spilled else (hashes, None))
+        
+        # Scalanie jak w liczniku binarnym: seria nie jest mniejsza niż połowa poprzedniej,
+        # więc serii jest O(log n), a każdy odcisk scalany jest O(log n) razy
+        while len(runs) > 1 and len(runs[-2][0]) <= 2 * len(runs[-1][0]):
+            newer, newer_path = runs.pop()
+            older, older_path = runs.pop()
+            merged = np.concatenate([older, newer])
+            merged.sort(kind='mergesort')
+            # Zamknięcie widoków mmap przed usunięciem plików
+            del newer, older
+            for path in (newer_path, older_path):
+                if path is not None:
+                    os.remove(path)
+            runs.append(self._write_run(part, merged) if self.spilled else (merged, None))
+    
+    def _spill(self) -> None:
+        self._spill_path = tempfile.mkdtemp(prefix='dedup_', dir=self.spill_dir)
+        self._runs = [[self._write_run(part, run) for run, _ in runs] for part, runs in enumerate(self._runs)]
+        logger.info(f"Zbiór odcisków duplikatów przeniesiony na dysk: {self._spill_path}")
+    
+    def __del__(self):
+        self._runs = []
+        if getattr(self, '_spill_path', None) is not None:
+            shutil.rmtree(self._spill_path, ignore_errors=True)
+
+
+class CsvCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 2 * 1024 ** 3,
+                 max_age: Optional[float] = None, storage_format: Optional[str] = None):
+        if storage_format is None:
+            storage_format = 'feather' if HAS_PYARROW else 'pickle'
+        if storage_format not in ('feather', 'pickle'):
+            raise ValueError(f"Nieobsługiwany format pamięci podręcznej: {storage_format}")
+        if storage_format == 'feather' and not HAS_PYARROW:
+            raise ImportError("Format feather wymaga pakietu pyarrow")
+        
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.storage_format = storage_format
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    def key(self, file_path: str, **kwargs) -> str:
+        stat = os.stat(file_path)
+        payload = json.dumps(
+            [os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns, sorted(kwargs.items())],
+            default=repr
+        )
+        return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+    
+    def load(self, file_path: str, loader: Callable[..., pd.DataFrame] = pd.read_csv, **kwargs) -> pd.DataFrame:
+        entry = os.path.join(self.cache_dir, f"{self.key(file_path, **kwargs)}.{self.storage_format}")
+        
+        if os.path.exists(entry):
+            try:
+                df = self._read(entry)
+            except Exception as e:
+                logger.warning(f"Uszkodzony wpis pamięci podręcznej {entry}: {str(e)}")
+                os.remove(entry)
+            else:
+                self.hits += 1
+                os.utime(entry)
+                return df
+        
+        self.misses += 1
+        df = loader(file_path, **kwargs)
+        self._write(df, entry)
+        self.evict()
+        return df
+    
+    def evict(self) -> int:
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.feather', '.pickle')):
+                path = os.path.join(self.cache_dir, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        
+        removed = 0
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        for mtime, size, path in entries:
+            expired = self.max_age is not None and now - mtime > self.max_age
+            if not expired and total <= self.max_bytes:
+                continue
+            os.remove(path)
+            total -= size
+            removed += 1
+        
+        if removed:
+            logger.info(f"Usunięto {removed} wpisów z pamięci podręcznej")
+        return removed
+    
+    def clear(self) -> None:
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(('.feather', '.pickle')):
+                os.remove(os.path.join(self.cache_dir, name))
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def stats(self) -> Dict[str, int]:
+        sizes = [
+            os.path.getsize(os.path.join(self.cache_dir, name))
+            for name in os.listdir(self.cache_dir) if name.endswith(('.feather', '.pickle'))
+        ]
+        return {'hits': self.hits, 'misses': self.misses, 'entries': len(sizes), 'size_bytes': sum(sizes)}
+    
+    def _read(self, entry: str) -> pd.DataFrame:
+        if self.storage_format == 'feather':
+            return feather.read_table(entry, memory_map=True).to_pandas()
+        return pd.read_pickle(entry)
+    
+    def _write(self, df: pd.DataFrame, entry: str) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            if self.storage_format == 'feather':
+                # Bez kompresji, żeby odczyt mógł korzystać z mapowania pamięci
+                feather.write_feather(df, tmp_path, compression='uncompressed')
+            else:
+                df.to_pickle(tmp_path)
+            os.replace(tmp_path, entry)
+        except Exception as e:
+            logger.warning(f"Nie udało się zapisać pamięci podręcznej dla {entry}: {str(e)}")
+            os.remove(tmp_path)
+
 
 class DataProcessor:
-    def __init__(self):
+    def __init__(self, max_memory_hashes: int = 10_000_000, spill_dir: Optional[str] = None,
+                 cache: Optional[CsvCache] = None):
         self.processed_data = None
         self.original_shape = None
+        self.max_memory_hashes = max_memory_hashes
+        self.spill_dir = spill_dir
+        self.cache = cache
+        self.memory_report = None
+        self._deduplicators: Dict[Optional[Tuple[str, ...]], HashDeduplicator] = {}
     
-    def load_and_validate(self, data: Union[pd.DataFrame, str, Dict]) -> pd.DataFrame:
+    def load_and_validate(self, data: Union[pd.DataFrame, str, Dict], chunksize: Optional[int] = None,
+                          optimize: bool = False, copy: bool = True) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        if chunksize is not None:
+            if chunksize <= 0:
+                raise ValueError("Rozmiar porcji musi być dodatni")
+            if not isinstance(data, (pd.DataFrame, str, dict)):
+                raise ValueError("Nieobsługiwany format danych")
+            if isinstance(data, str) and not os.path.exists(data):
+                raise FileNotFoundError(f"Plik nie został znaleziony: {data}")
+            self.reset_stream_state()
+            return self._iter_chunks(data, chunksize, optimize)
+        
         if isinstance(data, pd.DataFrame):
-            df = data.copy()
+            # copy=False: wynik współdzieli bufory z wejściem; przy copy-on-write
+            # (pandas >= 3) pierwsza modyfikacja którejkolwiek strony wykona kopię
+            df = data.copy(deep=copy)
         elif isinstance(data, str):
             try:
-                df = pd.read_csv(data)
+                df = self.cache.load(data) if self.cache is not None else pd.read_csv(data)
             except FileNotFoundError:
                 raise FileNotFoundError(f"Plik nie został znaleziony: {data}")
         elif isinstance(data, dict):
-            df = pd.DataFrame(data)
+            df = pd.DataFrame(data, copy=copy)
         else:
             raise ValueError("Nieobsługiwany format danych")
         
         self.original_shape = df.shape
         logger.info(f"Dane załadowane pomyślnie. Kształt: {df.shape}")
+        
+        if optimize:
+            df = self.optimize_dtypes(df)
         return df
     
-    def remove_duplicates(self, df: pd.DataFrame, subset: Optional[List[str]] = None) -> pd.DataFrame:
+    def optimize_dtypes(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+        memory_before = int(df.memory_usage(deep=True).sum())
+        df = optimize_dtypes(df, **kwargs)
+        memory_after = int(df.memory_usage(deep=True).sum())
+        
+        self.memory_report = {
+            'before_bytes': memory_before,
+            'after_bytes': memory_after,
+            'reduction': 1 - memory_after / memory_before if memory_before else 0.0
+        }
+        logger.info(f"Pamięć danych zmniejszona z {memory_before} do {memory_after} bajtów")
+        return df
+    
+    def reset_stream_state(self) -> None:
+        self.original_shape = None
+        for deduplicator in self._deduplicators.values():
+            deduplicator.close()
+        self._deduplicators = {}
+    
+    def _read_chunks(self, data: Union[pd.DataFrame, str, Dict], chunksize: int) -> Iterator[pd.DataFrame]:
+        if isinstance(data, str):
+            return iter(pd.read_csv(data, chunksize=chunksize))
+        df = pd.DataFrame(data) if isinstance(data, dict) else data
+        return (df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize))
+    
+    def _stream_dtypes(self, data: Union[pd.DataFrame, str, Dict], chunksize: int) -> Dict[Any, Any]:
+        # Pierwsze przejście: typy wybrane dla każdej porcji są poszerzane do wspólnego typu.
+        # Kategorie różniłyby się między porcjami, więc tylko zawężanie typów
+        dtypes = {}
+        conflicted = set()
+        missing = set()
+        for chunk in self._read_chunks(data, chunksize):
+            optimized = optimize_dtypes(chunk, categorical_threshold=0.0)
+            for col in optimized.columns:
+                dtype = optimized[col].dtype
+                has_missing = chunk[col].isna()
+                if has_missing.any():
+                    missing.add(col)
+                # Porcja z samymi brakami nie narzuca typu (read_csv daje wtedy float64 nawet dla dat)
+                if col in conflicted or has_missing.all():
+                    continue
+                if col not in dtypes or dtypes[col] == dtype:
+                    dtypes[col] = dtype
+                    continue
+                try:
+                    dtypes[col] = np.result_type(dtypes[col], dtype)
+                except TypeError:
+                    # Typów nie da się pogodzić - kolumna zostaje w typie odczytu
+                    conflicted.add(col)
+                    del dtypes[col]
+        
+        # Braki w kolumnie całkowitej lub logicznej wymagają typu, który je pomieści
+        for col in missing & set(dtypes):
+            if pd.api.types.is_bool_dtype(dtypes[col]):
+                dtypes[col] = np.dtype(object)
+            elif pd.api.types.is_integer_dtype(dtypes[col]):
+                dtypes[col] = np.result_type(dtypes[col], np.float32)
+        return dtypes
+    
+    def _iter_chunks(self, data: Union[pd.DataFrame, str, Dict], chunksize: int,
+                     optimize: bool = False) -> Iterator[pd.DataFrame]:
+        if optimize:
+            dtypes = self._stream_dtypes(data, chunksize)
+            memory_before = memory_after = 0
+        
+        for chunk in self._read_chunks(data, chunksize):
+            if self.original_shape is None:
+                self.original_shape = (0, chunk.shape[1])
+            elif chunk.shape[1] != self.original_shape[1]:
+                raise ValueError(f"Niezgodna liczba kolumn w porcji: {chunk.shape[1]} zamiast {self.original_shape[1]}")
+            self.original_shape = (self.original_shape[0] + len(chunk), chunk.shape[1])
+            if optimize:
+                memory_before += int(chunk.memory_usage(deep=True).sum())
+                chunk = _apply_dtypes(chunk, dtypes)
+                memory_after += int(chunk.memory_usage(deep=True).sum())
+                self.memory_report = {
+                    'before_bytes': memory_before,
+                    'after_bytes': memory_after,
+                    'reduction': 1 - memory_after / memory_before if memory_before else 0.0
+                }
+            yield chunk
+        
+        logger.info(f"Strumień danych zakończony. Kształt: {self.original_shape}")
+    
+    def remove_duplicates(self, df: pd.DataFrame, subset: Optional[List[str]] = None,
+                          across_chunks: bool = False) -> pd.DataFrame:
         initial_count = len(df)
-        df_clean = df.drop_duplicates(subset=subset)
+        if across_chunks:
+            key = None if subset is None else tuple(subset)
+            if key not in self._deduplicators:
+                self._deduplicators[key] = HashDeduplicator(
+                    subset, max_memory_hashes=self.max_memory_hashes, spill_dir=self.spill_dir
+                )
+            df_clean = self._deduplicators[key].filter(df)
+        else:
+            df_clean = df.drop_duplicates(subset=subset)
         removed_count = initial_count - len(df_clean)
         
         if removed_count > 0:
@@ -39,40 +389,501 @@ class DataProcessor:
         return df_clean
 
 
-def load_csv_safe(file_path: str, encoding: str = 'utf-8', **kwargs) -> pd.DataFrame:
+def optimize_dtypes(df: pd.DataFrame, categorical_threshold: float = 0.5, parse_dates: bool = True,
+                    allow_precision_loss: bool = False) -> pd.DataFrame:
+    optimized = {}
+    
+    for col in df.columns:
+        series = df[col]
+        
+        if pd.api.types.is_bool_dtype(series) or isinstance(series.dtype, pd.CategoricalDtype):
+            continue
+        
+        if pd.api.types.is_integer_dtype(series):
+            downcast = 'unsigned' if len(series) and series.min() >= 0 else 'integer'
+            optimized[col] = pd.to_numeric(series, downcast=downcast)
+        
+        elif pd.api.types.is_float_dtype(series):
+            candidate = series.astype(np.float32)
+            if allow_precision_loss or np.array_equal(candidate.to_numpy(np.float64), series.to_numpy(), equal_nan=True):
+                optimized[col] = candidate
+        
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            non_null = series.dropna()
+            if non_null.empty:
+                continue
+            
+            if parse_dates:
+                parsed = _parse_date_column(series, non_null)
+                if parsed is not None:
+                    optimized[col] = parsed
+                    continue
+            
+            if non_null.nunique() < categorical_threshold * len(series):
+                optimized[col] = series.astype('category')
+    
+    return df.assign(**optimized) if optimized else df
+
+
+def _apply_dtypes(df: pd.DataFrame, dtypes: Dict[Any, Any]) -> pd.DataFrame:
+    converted = {}
+    for col, dtype in dtypes.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        if pd.api.types.is_datetime64_any_dtype(dtype):
+            converted[col] = pd.to_datetime(df[col], format=_ISO8601_FORMAT, errors='coerce').astype(dtype)
+        else:
+            converted[col] = df[col].astype(dtype)
+    return df.assign(**converted) if converted else df
+
+
+def _parse_date_column(series: pd.Series, non_null: pd.Series) -> Optional[pd.Series]:
+    sample = non_null.iloc[:1000]
+    if not all(isinstance(value, str) and _DATE_LIKE_RE.match(value) for value in sample):
+        return None
+    
+    parsed = pd.to_datetime(series, format=_ISO8601_FORMAT, errors='coerce')
+    if parsed.notna().sum() != len(non_null):
+        return None
+    return parsed
+
+
+def load_csv_safe(file_path: str, encoding: Optional[str] = None,
+                  cache: Optional[CsvCache] = None, **kwargs) -> pd.DataFrame:
+    if cache is not None:
+        return cache.load(file_path, load_csv_safe, encoding=encoding, **kwargs)
+    
+    sniffed = False
     try:
+        if encoding is None and _can_sniff(file_path, kwargs.get('compression', 'infer')):
+            csv_format = sniff_csv_format(file_path)
+            encoding = csv_format['encoding']
+            sniffed = True
+            if 'sep' not in kwargs and 'delimiter' not in kwargs:
+                kwargs['sep'] = csv_format['delimiter']
+            kwargs.setdefault('quotechar', csv_format['quotechar'])
+            kwargs.setdefault('decimal', csv_format['decimal'])
+        elif encoding is None:
+            # Pliki skompresowane i bufory: bajty próbki nie są tekstem CSV, zostaje utf-8 z ponowieniem
+            encoding = 'utf-8'
+        
         df = pd.read_csv(file_path, encoding=encoding, **kwargs)
         logger.info(f"Pomyślnie załadowano {file_path} o kształcie {df.shape}")
         return df
     except UnicodeDecodeError:
-        logger.warning(f"Kodowanie UTF-8 nie powiodło się, próba latin-1 dla {file_path}")
+        # Próbka nie wykryła błędu, który pojawił się dalej w pliku
+        logger.warning(f"Kodowanie {encoding} nie powiodło się, próba latin-1 dla {file_path}")
+        if sniffed:
+            clear_format_cache(file_path)
         return pd.read_csv(file_path, encoding='latin-1', **kwargs)
     except Exception as e:
         logger.error(f"Nie udało się załadować {file_path}: {str(e)}")
         raise
 
 
-def normalize_data(data: Union[pd.Series, np.ndarray, List], method: str = 'minmax') -> np.ndarray:
-    data_array = np.array(data)
+_COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.zip', '.xz', '.zst', '.tar', '.tgz')
+
+
+def _can_sniff(file_path: Any, compression: Any) -> bool:
+    if not isinstance(file_path, (str, os.PathLike)) or not os.path.isfile(file_path):
+        return False
+    if compression is None:
+        return True
+    return compression == 'infer' and not os.fspath(file_path).lower().endswith(_COMPRESSED_SUFFIXES)
+
+
+def _detect_encoding(sample: bytes) -> str:
+    if sample.startswith(codecs.BOM_UTF8):
+        return 'utf-8-sig'
+    if sample.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return 'utf-16'
+    
+    try:
+        # final=False, bo próbka może uciąć znak wielobajtowy na końcu
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'latin-1'
+
+
+# Unieważnienie pojedynczej ścieżki zmienia jej generację, więc stary wpis nie jest już trafiany
+_format_generations: Dict[str, int] = {}
+
+
+@lru_cache(maxsize=4096)
+def _sniff_csv_format_cached(file_path: str, mtime_ns: int, size: int, sample_size: int,
+                             generation: int) -> Tuple[Tuple[str, Any], ...]:
+    with open(file_path, 'rb') as f:
+        sample = f.read(sample_size)
+    
+    encoding = _detect_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=False)
+    text = text.lstrip('\ufeff')
+    if len(sample) == sample_size and '\n' in text:
+        text = text[:text.rindex('\n')]
+    
+    sniffer = csv.Sniffer()
+    try:
+        dialect = sniffer.sniff(text, delimiters=',;\t|')
+        delimiter, quotechar = dialect.delimiter, dialect.quotechar
+    except csv.Error:
+        delimiter, quotechar = ',', '"'
+    
+    try:
+        has_header = sniffer.has_header(text)
+    except csv.Error:
+        has_header = True
+    
+    decimal = '.'
+    if delimiter == ';' and _DECIMAL_COMMA_RE.search(text):
+        decimal = ','
+    
+    return (
+        ('encoding', encoding),
+        ('delimiter', delimiter),
+        ('quotechar', quotechar),
+        ('decimal', decimal),
+        ('has_header', has_header),
+    )
+
+
+def sniff_csv_format(file_path: str, sample_size: int = 64 * 1024) -> Dict[str, Any]:
+    if os.fspath(file_path).lower().endswith(_COMPRESSED_SUFFIXES):
+        raise ValueError(f"Wykrywanie formatu wymaga nieskompresowanego pliku: {file_path}")
+    stat = os.stat(file_path)
+    path = os.path.abspath(file_path)
+    return dict(_sniff_csv_format_cached(
+        path, stat.st_mtime_ns, stat.st_size, sample_size, _format_generations.get(path, 0)
+    ))
+
+
+def clear_format_cache(file_path: Optional[str] = None) -> None:
+    if file_path is None:
+        _sniff_csv_format_cached.cache_clear()
+        _format_generations.clear()
+    else:
+        path = os.path.abspath(file_path)
+        _format_generations[path] = _format_generations.get(path, 0) + 1
+
+
+def load_csv_many(paths: Union[str, List[str]], max_workers: Optional[int] = None,
+                  check_schema: bool = True, source_column: Optional[str] = None,
+                  **kwargs) -> pd.DataFrame:
+    if isinstance(paths, str):
+        file_paths = sorted(glob.glob(paths))
+        if not file_paths:
+            raise FileNotFoundError(f"Brak plików pasujących do wzorca: {paths}")
+    else:
+        file_paths = list(paths)
+        if not file_paths:
+            raise ValueError("Lista plików nie może być pusta")
+    
+    worker = partial(load_csv_safe, **kwargs)
+    if max_workers == 1 or len(file_paths) == 1:
+        frames = [worker(path) for path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            frames = list(executor.map(worker, file_paths))
+    
+    if check_schema:
+        reference = frames[0]
+        for path, frame in zip(file_paths[1:], frames[1:]):
+            if list(frame.columns) != list(reference.columns):
+                raise ValueError(
+                    f"Niezgodny schemat w pliku {path}: {list(frame.columns)} zamiast {list(reference.columns)}"
+                )
+            mismatched = [col for col in frame.columns if frame[col].dtype != reference[col].dtype]
+            if mismatched:
+                logger.warning(f"Różne typy kolumn {mismatched} w pliku {path}")
+    
+    if source_column is not None:
+        frames = [frame.assign(**{source_column: path}) for path, frame in zip(file_paths, frames)]
+    
+    df = pd.concat(frames, ignore_index=True)
+    logger.info(f"Załadowano {len(file_paths)} plików o łącznym kształcie {df.shape}")
+    return df
+
+
+def normalize_data(data: Union[pd.DataFrame, pd.Series, np.ndarray, List], method: str = 'minmax',
+                   axis: Optional[int] = None, out: Optional[np.ndarray] = None,
+                   dtype: Optional[np.dtype] = None) -> np.ndarray:
+    data_array = np.asarray(data)
+    if not (np.issubdtype(data_array.dtype, np.number) or data_array.dtype == bool):
+        raise ValueError("Dane do normalizacji muszą być numeryczne")
+    
+    # Dotychczasowe zachowanie: stałe dane dają zera o typie danych wejściowych
+    keep_input_dtype = axis is None and out is None and dtype is None
+    
+    if out is not None:
+        if out.shape != data_array.shape:
+            raise ValueError(f"Nieprawidłowy kształt tablicy wyjściowej: {out.shape} zamiast {data_array.shape}")
+        result = out
+    else:
+        if dtype is None:
+            dtype = data_array.dtype if np.issubdtype(data_array.dtype, np.floating) else np.float64
+        result = np.empty(data_array.shape, dtype=dtype)
     
     if method == 'minmax':
-        min_val, max_val = np.min(data_array), np.max(data_array)
-        if max_val == min_val:
-            return np.zeros_like(data_array)
-        return (data_array - min_val) / (max_val - min_val)
+        center = np.min(data_array, axis=axis, keepdims=True)
+        scale = np.max(data_array, axis=axis, keepdims=True) - center
     
     elif method == 'zscore':
-        mean_val, std_val = np.mean(data_array), np.std(data_array)
-        if std_val == 0:
-            return np.zeros_like(data_array)
-        return (data_array - mean_val) / std_val
+        center = np.mean(data_array, axis=axis, keepdims=True)
+        scale = np.std(data_array, axis=axis, keepdims=True)
     
     elif method == 'robust':
-        median_val = np.median(data_array)
-        mad = np.median(np.abs(data_array - median_val))
-        if mad == 0:
-            return np.zeros_like(data_array)
-        return (data_array - median_val) / mad
+        center = np.median(data_array, axis=axis, keepdims=True)
+        # Bufor wynikowy służy też jako tablica tymczasowa dla |x - mediana|, chyba że to samo wejście
+        scratch = np.empty_like(result) if np.shares_memory(result, data_array) else result
+        np.subtract(data_array, center, out=scratch, casting='same_kind')
+        np.abs(scratch, out=scratch)
+        scale = np.median(scratch, axis=axis, keepdims=True)
     
     else:
         raise ValueError(f"Nieobsługiwana metoda normalizacji: {method}")
+    
+    constant = scale == 0
+    if keep_input_dtype and constant.all():
+        return np.zeros_like(data_array)
+    
+    np.subtract(data_array, center, out=result, casting='same_kind')
+    np.divide(result, np.where(constant, 1, scale), out=result, casting='same_kind')
+    if constant.any():
+        np.copyto(result, 0, where=np.broadcast_to(constant, result.shape))
+    
+    return result
+
+
+class Normalizer(ABC):
+    method = None
+    
+    def __init__(self):
+        self.n_samples_seen = 0
+        self.center_ = None
+        self.scale_ = None
+    
+    def fit(self, data: Union[pd.DataFrame, pd.Series, np.ndarray, List]) -> 'Normalizer':
+        self._reset()
+        return self.partial_fit(data)
+    
+    def partial_fit(self, data: Union[pd.DataFrame, pd.Series, np.ndarray, List]) -> 'Normalizer':
+        batch = self._validate(data)
+        if len(batch) == 0:
+            return self
+        self._update(batch)
+        self.n_samples_seen += len(batch)
+        self.center_, self.scale_ = self._compute_params()
+        return self
+    
+    def transform(self, data: Union[pd.DataFrame, pd.Series, np.ndarray, List]) -> np.ndarray:
+        self._check_fitted()
+        data_array = self._validate(data)
+        safe_scale = np.where(self.scale_ == 0, 1.0, self.scale_)
+        result = (data_array - self.center_) / safe_scale
+        # Stała cecha daje zera, tak jak normalize_data
+        return np.where(self.scale_ == 0, 0.0, result)
+    
+    def inverse_transform(self, data: Union[pd.DataFrame, pd.Series, np.ndarray, List]) -> np.ndarray:
+        self._check_fitted()
+        data_array = self._validate(data)
+        return data_array * self.scale_ + self.center_
+    
+    def fit_transform(self, data: Union[pd.DataFrame, pd.Series, np.ndarray, List]) -> np.ndarray:
+        return self.fit(data).transform(data)
+    
+    def merge(self, other: 'Normalizer') -> 'Normalizer':
+        if type(other) is not type(self):
+            raise ValueError("Można łączyć tylko normalizatory tego samego typu")
+        if other.n_samples_seen == 0:
+            return self
+        self._merge(other)
+        self.n_samples_seen += other.n_samples_seen
+        self.center_, self.scale_ = self._compute_params()
+        return self
+    
+    def save(self, path: str) -> None:
+        self._check_fitted()
+        with open(path, 'wb') as f:
+            np.savez(f, method=self.method, n_samples_seen=self.n_samples_seen, **self._get_state())
+    
+    @staticmethod
+    def load(path: str) -> 'Normalizer':
+        with np.load(path, allow_pickle=False) as archive:
+            method = str(archive['method'])
+            if method not in _NORMALIZERS:
+                raise ValueError(f"Nieobsługiwana metoda normalizacji: {method}")
+            normalizer = _NORMALIZERS[method]()
+            normalizer.n_samples_seen = int(archive['n_samples_seen'])
+            normalizer._set_state({key: archive[key] for key in archive.files if key not in ('method', 'n_samples_seen')})
+        normalizer.center_, normalizer.scale_ = normalizer._compute_params()
+        return normalizer
+    
+    def _validate(self, data: Union[pd.DataFrame, pd.Series, np.ndarray, List]) -> np.ndarray:
+        data_array = np.asarray(data, dtype=np.float64)
+        if data_array.ndim not in (1, 2):
+            raise ValueError("Dane muszą być jedno- lub dwuwymiarowe")
+        return data_array
+    
+    def _check_fitted(self) -> None:
+        if self.center_ is None:
+            raise ValueError("Normalizator nie został dopasowany")
+    
+    def _reset(self) -> None:
+        self.__init__()
+    
+    @abstractmethod
+    def _update(self, batch: np.ndarray) -> None:
+        ...
+    
+    @abstractmethod
+    def _merge(self, other: 'Normalizer') -> None:
+        ...
+    
+    @abstractmethod
+    def _compute_params(self) -> Tuple[np.ndarray, np.ndarray]:
+        ...
+    
+    @abstractmethod
+    def _get_state(self) -> Dict[str, np.ndarray]:
+        ...
+    
+    @abstractmethod
+    def _set_state(self, state: Dict[str, np.ndarray]) -> None:
+        ...
+
+
+class MinMaxNormalizer(Normalizer):
+    method = 'minmax'
+    
+    def __init__(self):
+        super().__init__()
+        self.min_ = None
+        self.max_ = None
+    
+    def _update(self, batch: np.ndarray) -> None:
+        self._combine(batch.min(axis=0), batch.max(axis=0))
+    
+    def _merge(self, other: 'MinMaxNormalizer') -> None:
+        self._combine(other.min_, other.max_)
+    
+    def _combine(self, batch_min: np.ndarray, batch_max: np.ndarray) -> None:
+        if self.min_ is None:
+            self.min_, self.max_ = batch_min, batch_max
+        else:
+            self.min_ = np.minimum(self.min_, batch_min)
+            self.max_ = np.maximum(self.max_, batch_max)
+    
+    def _compute_params(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.min_, self.max_ - self.min_
+    
+    def _get_state(self) -> Dict[str, np.ndarray]:
+        return {'min': self.min_, 'max': self.max_}
+    
+    def _set_state(self, state: Dict[str, np.ndarray]) -> None:
+        self.min_, self.max_ = state['min'], state['max']
+
+
+class ZScoreNormalizer(Normalizer):
+    method = 'zscore'
+    
+    def __init__(self):
+        super().__init__()
+        self.mean_ = None
+        self.m2_ = None
+    
+    def _update(self, batch: np.ndarray) -> None:
+        mean_b = batch.mean(axis=0)
+        self._combine(len(batch), mean_b, ((batch - mean_b) ** 2).sum(axis=0))
+    
+    def _merge(self, other: 'ZScoreNormalizer') -> None:
+        self._combine(other.n_samples_seen, other.mean_, other.m2_)
+    
+    def _combine(self, n_b: int, mean_b: np.ndarray, m2_b: np.ndarray) -> None:
+        # Łączenie momentów partii metodą Chana (uogólnienie Welforda)
+        if self.mean_ is None:
+            self.mean_, self.m2_ = mean_b, m2_b
+            return
+        
+        n_a = self.n_samples_seen
+        n = n_a + n_b
+        delta = mean_b - self.mean_
+        self.mean_ = self.mean_ + delta * n_b / n
+        self.m2_ = self.m2_ + m2_b + delta ** 2 * n_a * n_b / n
+    
+    def _compute_params(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.mean_, np.sqrt(self.m2_ / self.n_samples_seen)
+    
+    def _get_state(self) -> Dict[str, np.ndarray]:
+        return {'mean': self.mean_, 'm2': self.m2_}
+    
+    def _set_state(self, state: Dict[str, np.ndarray]) -> None:
+        self.mean_, self.m2_ = state['mean'], state['m2']
+
+
+class RobustNormalizer(Normalizer):
+    method = 'robust'
+    
+    def __init__(self, k: int = 200, random_state: Optional[int] = None):
+        super().__init__()
+        self.k = k
+        self.random_state = random_state
+        self.sketches_ = None
+        self._one_dim = False
+    
+    def _reset(self) -> None:
+        self.__init__(self.k, self.random_state)
+    
+    def _update(self, batch: np.ndarray) -> None:
+        # Jeden szkic kwantyli na kolumnę; mediana i MAD są przybliżone z błędem rangi sketch.rank_error
+        columns = batch.reshape(len(batch), -1)
+        if self.sketches_ is None:
+            self._one_dim = batch.ndim == 1
+            self.sketches_ = [
+                QuantileSketch(self.k, None if self.random_state is None else self.random_state + i)
+                for i in range(columns.shape[1])
+            ]
+        for sketch, column in zip(self.sketches_, columns.T):
+            sketch.update(column)
+    
+    def _merge(self, other: 'RobustNormalizer') -> None:
+        if self.sketches_ is None:
+            self._one_dim = other._one_dim
+            self.sketches_ = [QuantileSketch(self.k) for _ in other.sketches_]
+        for sketch, other_sketch in zip(self.sketches_, other.sketches_):
+            sketch.merge(other_sketch)
+    
+    def _compute_params(self) -> Tuple[np.ndarray, np.ndarray]:
+        median = np.array([sketch.quantile(0.5) for sketch in self.sketches_])
+        mad = np.array([sketch.median_absolute_deviation() for sketch in self.sketches_])
+        if self._one_dim:
+            return median[0], mad[0]
+        return median, mad
+    
+    def _get_state(self) -> Dict[str, np.ndarray]:
+        state = {'k': np.array(self.k), 'one_dim': np.array(self._one_dim)}
+        for i, sketch in enumerate(self.sketches_):
+            for key, value in sketch.to_arrays().items():
+                state[f'{key}_{i}'] = value
+        return state
+    
+    def _set_state(self, state: Dict[str, np.ndarray]) -> None:
+        self.k = int(state['k'])
+        self._one_dim = bool(state['one_dim'])
+        n_columns = sum(1 for key in state if key.startswith('meta_'))
+        self.sketches_ = [
+            QuantileSketch.from_arrays(state[f'items_{i}'], state[f'level_sizes_{i}'], state[f'meta_{i}'])
+            for i in range(n_columns)
+        ]
+
+
+_NORMALIZERS = {
+    'minmax': MinMaxNormalizer,
+    'zscore': ZScoreNormalizer,
+    'robust': RobustNormalizer,
+}
+
+
+def get_normalizer(method: str = 'minmax', **kwargs) -> Normalizer:
+    if method not in _NORMALIZERS:
+        raise ValueError(f"Nieobsługiwana metoda normalizacji: {method}")
+    return _NORMALIZERS[method](**kwargs)
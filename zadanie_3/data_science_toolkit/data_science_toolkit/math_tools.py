@@ -1,35 +1,548 @@
 import numpy as np
 import pandas as pd
-from typing import Union, List, Tuple, Optional, Dict
+from typing import Union, List, Tuple, Optional, Dict, Iterator, Callable
+from collections import deque
+from collections.abc import MutableSequence
+import bisect
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import math
-from scipy import stats
+import os
+import pickle
+import time
+from scipy import stats, signal, sparse
 import warnings
+from abc import ABC, abstractmethod
+
+
+_MOMENT_BLOCK_SIZE = 1 << 16
+
+
+class _Moments:
+    __slots__ = ('n', 'mean', 'm2', 'm3', 'm4', 'min', 'max')
+    
+    def __init__(self, n: int = 0, mean: float = 0.0, m2: float = 0.0, m3: float = 0.0, m4: float = 0.0,
+                 minimum: float = np.nan, maximum: float = np.nan):
+        self.n = n
+        self.mean = mean
+        self.m2 = m2
+        self.m3 = m3
+        self.m4 = m4
+        self.min = minimum
+        self.max = maximum
+    
+    @classmethod
+    def from_block(cls, block: np.ndarray) -> '_Moments':
+        mean = block.mean(dtype=np.float64)
+        d = block - mean
+        d2 = d * d
+        # Minimum i maksimum liczone, gdy blok jest jeszcze w pamięci podręcznej
+        return cls(len(block), mean, d2.sum(), (d2 * d).sum(), (d2 * d2).sum(), block.min(), block.max())
+    
+    def merge(self, other: '_Moments') -> '_Moments':
+        # Łączenie momentów centralnych do 4. rzędu (wzory Pébaya)
+        na, nb = self.n, other.n
+        if nb == 0:
+            return self
+        if na == 0:
+            self.n, self.mean, self.m2, self.m3, self.m4 = other.n, other.mean, other.m2, other.m3, other.m4
+            self.min, self.max = other.min, other.max
+            return self
+        
+        n = na + nb
+        delta = other.mean - self.mean
+        delta_n = delta / n
+        term = delta * delta_n * na * nb
+        
+        self.m4 = (self.m4 + other.m4 + term * delta_n * delta_n * (na * na - na * nb + nb * nb)
+                   + 6 * delta_n * delta_n * (na * na * other.m2 + nb * nb * self.m2)
+                   + 4 * delta_n * (na * other.m3 - nb * self.m3))
+        self.m3 = (self.m3 + other.m3 + term * delta_n * (na - nb)
+                   + 3 * delta_n * (na * other.m2 - nb * self.m2))
+        self.m2 = self.m2 + other.m2 + term
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+        self.mean = self.mean + delta_n * nb
+        self.n = n
+        return self
+    
+    @property
+    def has_nan(self) -> bool:
+        return bool(np.isnan(self.mean))
+    
+    @property
+    def sample_var(self) -> float:
+        return np.float64(self.m2 / (self.n - 1)) if self.n > 1 else np.float64(np.nan)
+    
+    def _is_degenerate(self) -> bool:
+        # Ten sam próg co scipy.stats.skew/kurtosis dla niemal stałych danych
+        return self.m2 / self.n <= (np.finfo(np.float64).eps * self.mean) ** 2
+    
+    @property
+    def skewness(self) -> float:
+        if self.has_nan or self._is_degenerate():
+            return np.float64(np.nan)
+        return np.float64(np.sqrt(self.n) * self.m3 / self.m2 ** 1.5)
+    
+    @property
+    def kurtosis(self) -> float:
+        if self.has_nan or self._is_degenerate():
+            return np.float64(np.nan)
+        return np.float64(self.n * self.m4 / (self.m2 * self.m2) - 3.0)
+
+
+def _fused_moments(values: np.ndarray) -> _Moments:
+    # Każdy blok mieści się w pamięci podręcznej procesora, więc dane są czytane z RAM tylko raz
+    moments = _Moments()
+    for start in range(0, len(values), _MOMENT_BLOCK_SIZE):
+        moments.merge(_Moments.from_block(values[start:start + _MOMENT_BLOCK_SIZE]))
+    moments.mean = np.float64(moments.mean)
+    return moments
+
+
+def _lerp(a: np.ndarray, b: np.ndarray, t: np.ndarray) -> np.ndarray:
+    # Ta sama postać interpolacji co w np.percentile
+    diff = b - a
+    return np.where(t >= 0.5, b - diff * (1 - t), a + diff * t)
+
+
+def _partition_quantiles(values: np.ndarray, has_nan: bool = False) -> Tuple[float, float, float]:
+    if has_nan:
+        return np.float64(np.nan), np.float64(np.nan), np.float64(np.nan)
+    
+    n = len(values)
+    positions = np.array([0.25, 0.5, 0.75]) * (n - 1)
+    lower = np.floor(positions).astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    middle = [(n - 1) // 2, n // 2]
+    
+    partitioned = np.partition(values, np.unique(np.concatenate([lower, upper, middle])))
+    q25, _, q75 = _lerp(partitioned[lower].astype(np.float64), partitioned[upper].astype(np.float64),
+                        positions - lower)
+    median = (np.float64(partitioned[middle[0]]) + np.float64(partitioned[middle[1]])) / 2
+    return np.float64(q25), np.float64(median), np.float64(q75)
+
+
+_STATS_KEYS = ('count', 'mean', 'median', 'std', 'var', 'min', 'max', 'q25', 'q75', 'skewness', 'kurtosis')
+
+
+def _segmented_stats(codes: np.ndarray, values: np.ndarray, n_groups: int) -> Dict[str, np.ndarray]:
+    # Sortowanie po (grupa, wartość) daje ciągłe segmenty, więc wszystkie redukcje są wektorowe
+    order = np.lexsort((values, codes))
+    sorted_values = values[order]
+    sorted_codes = codes[order]
+    
+    counts = np.bincount(codes, minlength=n_groups)
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    ends = starts + counts - 1
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.add.reduceat(sorted_values, starts) / counts
+        d = sorted_values - mean[sorted_codes]
+        d2 = d * d
+        m2 = np.add.reduceat(d2, starts)
+        m3 = np.add.reduceat(d2 * d, starts)
+        m4 = np.add.reduceat(d2 * d2, starts)
+        
+        var = np.where(counts > 1, m2 / (counts - 1), np.nan)
+        degenerate = m2 / counts <= (np.finfo(np.float64).eps * mean) ** 2
+        skewness = np.where(degenerate, np.nan, np.sqrt(counts) * m3 / m2 ** 1.5)
+        kurtosis = np.where(degenerate, np.nan, counts * m4 / (m2 * m2) - 3.0)
+    
+    quantiles = {}
+    for key, q in (('q25', 0.25), ('q75', 0.75)):
+        positions = q * (counts - 1)
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.minimum(lower + 1, counts - 1)
+        quantiles[key] = _lerp(sorted_values[starts + lower], sorted_values[starts + upper], positions - lower)
+    median = (sorted_values[starts + (counts - 1) // 2] + sorted_values[starts + counts // 2]) / 2
+    
+    result = {
+        'count': counts,
+        'mean': mean,
+        'median': median,
+        'std': np.sqrt(var),
+        'var': var,
+        'min': sorted_values[starts].astype(np.float64),
+        'max': sorted_values[ends].astype(np.float64),
+        'q25': quantiles['q25'],
+        'q75': quantiles['q75'],
+        'skewness': skewness,
+        'kurtosis': kurtosis
+    }
+    
+    # NaN trafia na koniec segmentu; grupa z NaN daje NaN, tak jak descriptive_stats
+    has_nan = np.isnan(mean)
+    if has_nan.any():
+        for key in _STATS_KEYS[1:]:
+            result[key] = np.where(has_nan, np.nan, result[key])
+    return result
+
+
+_BOOTSTRAP_MAX_ELEMENTS = 1 << 22
+# Powyżej tego okna średnia prosta liczona jest z sum prefiksowych zamiast splotem
+_SMA_DIRECT_MAX_WINDOW = 128
+# Bloki, w których inwersje dla tau Kendalla liczone są bezpośrednim porównaniem par
+_INVERSION_BASE_BLOCK = 8
+
+
+def _bootstrap_chunk(data: np.ndarray, statistic: Callable, n_draws: int,
+                     seed: np.random.SeedSequence) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, len(data), size=(n_draws, len(data)))
+    return statistic(data[indices], axis=1)
+
+
+def _bootstrap_distribution(data: np.ndarray, statistic: Callable, n_resamples: int,
+                            random_state: Optional[int], chunk_size: Optional[int],
+                            n_jobs: Optional[int]) -> np.ndarray:
+    if n_resamples < 1:
+        raise ValueError("Liczba próbek bootstrap musi być dodatnia")
+    if chunk_size is None:
+        chunk_size = max(1, _BOOTSTRAP_MAX_ELEMENTS // len(data))
+    
+    sizes = [min(chunk_size, n_resamples - start) for start in range(0, n_resamples, chunk_size)]
+    # Osobny strumień losowy dla każdej porcji: wynik nie zależy od liczby procesów
+    seeds = np.random.SeedSequence(random_state).spawn(len(sizes))
+    worker = partial(_bootstrap_chunk, data, statistic)
+    
+    # Pula procesów wysyła statistic przez pickle: lambdy i domknięcia liczone są szeregowo
+    if n_jobs is not None and n_jobs > 1 and len(sizes) > 1:
+        try:
+            pickle.dumps(statistic)
+        except (pickle.PicklingError, AttributeError, TypeError):
+            warnings.warn("Funkcja statistic nie daje się serializować (pickle) - bootstrap liczony "
+                          "w jednym procesie; użyj funkcji zdefiniowanej na poziomie modułu",
+                          RuntimeWarning, stacklevel=3)
+            n_jobs = None
+    
+    if n_jobs is None or n_jobs <= 1 or len(sizes) == 1:
+        parts = [worker(size, seed) for size, seed in zip(sizes, seeds)]
+    else:
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            parts = list(executor.map(worker, sizes, seeds))
+    return np.concatenate(parts)
+
+
+def _bca_levels(data: np.ndarray, statistic: Callable, bootstrap: np.ndarray,
+                alpha: float, chunk_size: Optional[int]) -> np.ndarray:
+    n = len(data)
+    theta = statistic(data)
+    z0 = stats.norm.ppf(np.mean(bootstrap < theta))
+    
+    # Jackknife: macierz indeksów "bez i-tego" budowana porcjami, żeby ograniczyć pamięć
+    if chunk_size is None:
+        chunk_size = max(1, _BOOTSTRAP_MAX_ELEMENTS // n)
+    base = np.arange(n - 1)
+    jackknife = []
+    for start in range(0, n, chunk_size):
+        left_out = np.arange(start, min(start + chunk_size, n))[:, None]
+        indices = base + (base >= left_out)
+        jackknife.append(statistic(data[indices], axis=1))
+    jackknife = np.concatenate(jackknife)
+    
+    diff = jackknife.mean() - jackknife
+    denominator = 6 * np.sum(diff ** 2) ** 1.5
+    acceleration = np.sum(diff ** 3) / denominator if denominator > 0 else 0.0
+    
+    z = stats.norm.ppf([alpha, 1 - alpha])
+    levels = stats.norm.cdf(z0 + (z0 + z) / (1 - acceleration * (z0 + z)))
+    if np.isnan(levels).any():
+        # Rozkład zdegenerowany (np. wszystkie próbki bootstrap równe statystyce) - jak scipy.stats.bootstrap
+        warnings.warn("Przedział BCa jest nieokreślony dla zdegenerowanego rozkładu bootstrap",
+                      RuntimeWarning, stacklevel=3)
+    return levels
+
+
+class QuantileSketch:
+    
+    def __init__(self, k: int = 200, random_state: Optional[int] = None):
+        if k < 8:
+            raise ValueError("Parametr k szkicu musi wynosić co najmniej 8")
+        self.k = k
+        self.count = 0
+        self.min = np.nan
+        self.max = np.nan
+        self._levels = [np.empty(0)]
+        self._rng = np.random.default_rng(random_state)
+    
+    @property
+    def rank_error(self) -> float:
+        # Empiryczne oszacowanie normalizowanego błędu rangi szkicu KLL (~99% pewności),
+        # np. 1,65% dla k=200
+        return 3.3 / self.k
+    
+    @property
+    def is_exact(self) -> bool:
+        return len(self._levels) == 1
+    
+    def update(self, values: Union[List, np.ndarray, pd.Series]) -> 'QuantileSketch':
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return self
+        
+        self.count += len(values)
+        self.min = np.fmin(self.min, values.min())
+        self.max = np.fmax(self.max, values.max())
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+        return self
+    
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        if other.count == 0:
+            return self
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        
+        self.count += other.count
+        self.min = np.fmin(self.min, other.min)
+        self.max = np.fmax(self.max, other.max)
+        self._compress()
+        return self
+    
+    def quantile(self, q: Union[float, List, np.ndarray]) -> Union[float, np.ndarray]:
+        if self.count == 0:
+            raise ValueError("Szkic kwantyli jest pusty")
+        q = np.asarray(q, dtype=np.float64)
+        if np.any((q < 0) | (q > 1)):
+            raise ValueError("Kwantyle muszą należeć do przedziału [0, 1]")
+        
+        if self.is_exact:
+            result = np.quantile(self._levels[0], q)
+        else:
+            values, weights = self.weighted_items()
+            # Skrajne wartości są znane dokładnie, więc kotwiczą interpolację na krańcach
+            values = np.concatenate([[self.min], values, [self.max]])
+            weights = np.concatenate([[0.0], weights, [0.0]])
+            result = self._weighted_quantile(values, weights, q)
+        return float(result) if result.ndim == 0 else result
+    
+    def median_absolute_deviation(self) -> float:
+        median = self.quantile(0.5)
+        if self.is_exact:
+            return float(np.median(np.abs(self._levels[0] - median)))
+        
+        values, weights = self.weighted_items()
+        deviations = np.abs(values - median)
+        order = np.argsort(deviations, kind='mergesort')
+        return float(self._weighted_quantile(deviations[order], weights[order], np.asarray(0.5)))
+    
+    def cdf(self, values: Union[float, List, np.ndarray]) -> Union[float, np.ndarray]:
+        if self.count == 0:
+            raise ValueError("Szkic kwantyli jest pusty")
+        items, weights = self.weighted_items()
+        cumulative = np.concatenate([[0.0], np.cumsum(weights)])
+        lower = cumulative[np.searchsorted(items, values, side='left')]
+        upper = cumulative[np.searchsorted(items, values, side='right')]
+        return (lower + upper) / 2 / cumulative[-1]
+    
+    def weighted_items(self) -> Tuple[np.ndarray, np.ndarray]:
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self._levels)])
+        order = np.argsort(values, kind='mergesort')
+        return values[order], weights[order]
+    
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            'items': np.concatenate(self._levels),
+            'level_sizes': np.array([len(items) for items in self._levels]),
+            'meta': np.array([self.k, self.count, self.min, self.max], dtype=np.float64)
+        }
+    
+    @classmethod
+    def from_arrays(cls, items: np.ndarray, level_sizes: np.ndarray, meta: np.ndarray) -> 'QuantileSketch':
+        sketch = cls(k=int(meta[0]))
+        sketch.count = int(meta[1])
+        sketch.min, sketch.max = float(meta[2]), float(meta[3])
+        sketch._levels = np.split(np.asarray(items, dtype=np.float64), np.cumsum(level_sizes)[:-1])
+        return sketch
+    
+    def _capacity(self, level: int) -> int:
+        depth = len(self._levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+    
+    def _compress(self) -> None:
+        level = 0
+        while level < len(self._levels):
+            items = self._levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self._levels):
+                    self._levels.append(np.empty(0))
+                items = np.sort(items)
+                # Przy nieparzystej liczbie elementów jeden zostaje na bieżącym poziomie
+                keep = items[-1:] if len(items) % 2 else items[:0]
+                paired = items[:len(items) - len(keep)]
+                promoted = paired[self._rng.integers(2)::2]
+                self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+                self._levels[level] = keep.copy()
+            level += 1
+    
+    @staticmethod
+    def _weighted_quantile(values: np.ndarray, weights: np.ndarray, q: np.ndarray) -> np.ndarray:
+        cumulative = np.cumsum(weights)
+        centers = cumulative - weights / 2
+        return np.interp(q * cumulative[-1], centers, values)
+
+
+class _HistoryRecord:
+    __slots__ = ('name', 'timestamp', 'values')
+    
+    def __init__(self, name: str, timestamp: float, values: np.void):
+        self.name = name
+        self.timestamp = timestamp
+        self.values = values
+    
+    def as_tuple(self) -> Tuple[str, Dict[str, float]]:
+        return self.name, {key: self.values[key] for key in self.values.dtype.names}
+
+
+class CalculationHistory(MutableSequence):
+    # Zachowuje się jak dawna lista krotek (name, wartości): indeksowanie, wycinki, ==, +=, del
+    
+    def __init__(self, max_size: Optional[int] = None, enabled: bool = True):
+        if max_size is not None and max_size < 0:
+            raise ValueError("Rozmiar historii nie może być ujemny")
+        self.max_size = max_size
+        self.enabled = enabled and max_size != 0
+        self._records = deque(maxlen=max_size)
+        self._dtypes = {}
+    
+    def _make_record(self, entry: Tuple[str, Dict[str, float]]) -> _HistoryRecord:
+        name, values = entry
+        dtype = self._record_dtype(values)
+        record = np.array(tuple(values.values()), dtype=dtype)[()]
+        return _HistoryRecord(name, time.time(), record)
+    
+    def append(self, entry: Tuple[str, Dict[str, float]]) -> None:
+        if not self.enabled:
+            return
+        self._records.append(self._make_record(entry))
+    
+    def insert(self, index: int, entry: Tuple[str, Dict[str, float]]) -> None:
+        if not self.enabled:
+            return
+        if len(self._records) == self.max_size:
+            # Pełna historia traci najstarszy wpis, tak jak przy append
+            self._records.popleft()
+            index = max(index - 1, 0) if index >= 0 else index
+        self._records.insert(index, self._make_record(entry))
+    
+    def __len__(self) -> int:
+        return len(self._records)
+    
+    def __iter__(self) -> Iterator[Tuple[str, Dict[str, float]]]:
+        return (record.as_tuple() for record in self._records)
+    
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return [record.as_tuple() for record in list(self._records)[index]]
+        return self._records[index].as_tuple()
+    
+    def __setitem__(self, index: Union[int, slice], entry) -> None:
+        if isinstance(index, slice):
+            records = list(self._records)
+            records[index] = [self._make_record(item) for item in entry]
+            self._records = deque(records, maxlen=self.max_size)
+        else:
+            self._records[index] = self._make_record(entry)
+    
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            records = list(self._records)
+            del records[index]
+            self._records = deque(records, maxlen=self.max_size)
+        else:
+            del self._records[index]
+    
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (list, CalculationHistory)):
+            return list(self) == list(other)
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __add__(self, other) -> List[Tuple[str, Dict[str, float]]]:
+        if isinstance(other, (list, CalculationHistory)):
+            return list(self) + list(other)
+        return NotImplemented
+    
+    def __radd__(self, other) -> List[Tuple[str, Dict[str, float]]]:
+        if isinstance(other, list):
+            return other + list(self)
+        return NotImplemented
+    
+    def __repr__(self) -> str:
+        return f"CalculationHistory({list(self)!r})"
+    
+    def clear(self) -> None:
+        self._records.clear()
+    
+    def drain(self) -> List[Tuple[str, Dict[str, float]]]:
+        entries = list(self)
+        self._records.clear()
+        return entries
+    
+    def to_frame(self) -> pd.DataFrame:
+        rows = [
+            {'name': record.name, 'timestamp': record.timestamp, **record.as_tuple()[1]}
+            for record in self._records
+        ]
+        return pd.DataFrame(rows)
+    
+    def export(self, path: str, drain: bool = False) -> int:
+        frame = self.to_frame()
+        if not frame.empty:
+            write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+            frame.to_csv(path, mode='a', header=write_header, index=False)
+        if drain:
+            self._records.clear()
+        return len(frame)
+    
+    def _record_dtype(self, values: Dict[str, float]) -> np.dtype:
+        # Jeden wspólny dtype na zestaw kluczy zamiast osobnego słownika na każdy wpis
+        signature = tuple((key, np.asarray(value).dtype.str) for key, value in values.items())
+        if signature not in self._dtypes:
+            self._dtypes[signature] = np.dtype([(key, dtype) for key, dtype in signature])
+        return self._dtypes[signature]
 
 
 class StatisticalCalculator:
     
-    def __init__(self):
+    def __init__(self, history_size: Optional[int] = None, track_history: bool = True):
         self.last_calculation = None
-        self.calculation_history = []
+        self.calculation_history = CalculationHistory(history_size, track_history)
     
-    def descriptive_stats(self, data: Union[List, np.ndarray, pd.Series]) -> Dict[str, float]:
-        data_array = np.array(data)
+    def descriptive_stats(self, data: Union[List, np.ndarray, pd.Series, 'StreamingStats']) -> Dict[str, float]:
+        if isinstance(data, StreamingStats):
+            stats_dict = data.result()
+            self.last_calculation = stats_dict
+            self.calculation_history.append(('descriptive_stats', stats_dict))
+            return stats_dict
+        
+        data_array = np.asarray(data)
         
         if len(data_array) == 0:
             raise ValueError("Dane wejściowe nie mogą być puste")
         
+        values = data_array.ravel()
+        moments = _fused_moments(values)
+        q25, median, q75 = _partition_quantiles(values, moments.has_nan)
+        
         stats_dict = {
             'count': len(data_array),
-            'mean': np.mean(data_array),
-            'median': np.median(data_array),
-            'std': np.std(data_array, ddof=1),
-            'var': np.var(data_array, ddof=1),
-            'min': np.min(data_array),
-            'max': np.max(data_array),
-            'q25': np.percentile(data_array, 25),
-            'q75': np.percentile(data_array, 75),
-            'skewness': stats.skew(data_array),
-            'kurtosis': stats.kurtosis(data_array)
+            'mean': moments.mean,
+            'median': median,
+            'std': np.sqrt(moments.sample_var),
+            'var': moments.sample_var,
+            'min': moments.min,
+            'max': moments.max,
+            'q25': q25,
+            'q75': q75,
+            'skewness': moments.skewness,
+            'kurtosis': moments.kurtosis
         }
         
         self.last_calculation = stats_dict
@@ -37,47 +550,519 @@ class StatisticalCalculator:
         
         return stats_dict
     
-    def confidence_interval(self, data: Union[List, np.ndarray], confidence: float = 0.95) -> Tuple[float, float]:
+    def confidence_interval(self, data: Union[List, np.ndarray, 'StreamingStats'], confidence: float = 0.95,
+                            method: str = 't', statistic: Callable = np.mean, n_resamples: int = 9999,
+                            random_state: Optional[int] = None, chunk_size: Optional[int] = None,
+                            n_jobs: Optional[int] = None) -> Tuple[float, float]:
+        if isinstance(data, StreamingStats):
+            if method != 't':
+                raise ValueError("Akumulator strumieniowy obsługuje tylko przedział t")
+            return data.confidence_interval(confidence)
+        
         data_array = np.array(data)
         n = len(data_array)
         
         if n < 2:
             raise ValueError("Potrzeba co najmniej 2 punktów danych dla przedziału ufności")
         
-        mean = np.mean(data_array)
-        std_err = stats.sem(data_array)
+        if method == 't':
+            mean = np.mean(data_array)
+            std_err = stats.sem(data_array)
+            h = std_err * stats.t.ppf((1 + confidence) / 2, n - 1)
+            return (mean - h, mean + h)
+        
+        elif method in ('percentile', 'bca'):
+            bootstrap = _bootstrap_distribution(data_array, statistic, n_resamples, random_state, chunk_size, n_jobs)
+            alpha = (1 - confidence) / 2
+            
+            if method == 'percentile':
+                levels = np.array([alpha, 1 - alpha])
+            else:
+                levels = _bca_levels(data_array, statistic, bootstrap, alpha, chunk_size)
+                if np.isnan(levels).any():
+                    return (np.nan, np.nan)
+            
+            lower, upper = np.quantile(bootstrap, levels)
+            return (lower, upper)
+        
+        else:
+            raise ValueError(f"Nieobsługiwana metoda przedziału ufności: {method}")
+    
+    def confidence_interval_batch(self, data: Union[pd.DataFrame, np.ndarray],
+                                  confidence: float = 0.95) -> pd.DataFrame:
+        if isinstance(data, pd.DataFrame):
+            data = data.select_dtypes(include=[np.number])
+            index = data.columns
+        matrix = np.asarray(data, dtype=np.float64)
+        if matrix.ndim != 2:
+            raise ValueError("Dane muszą być dwuwymiarowe (kolumny to osobne próby)")
+        if not isinstance(data, pd.DataFrame):
+            index = pd.RangeIndex(matrix.shape[1])
+        
+        # Wartości NaN są pomijane osobno w każdej kolumnie
+        n = np.sum(~np.isnan(matrix), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.nansum(matrix, axis=0) / n
+            std = np.sqrt(np.nansum((matrix - mean) ** 2, axis=0) / (n - 1))
+            h = std / np.sqrt(n) * stats.t.ppf((1 + confidence) / 2, np.maximum(n - 1, 1))
+        h = np.where(n >= 2, h, np.nan)
+        
+        return pd.DataFrame({'lower': mean - h, 'upper': mean + h}, index=index)
+    
+    def grouped_stats(self, data: Union[pd.DataFrame, np.ndarray], by: Optional[Union[str, List[str]]] = None,
+                      column: Optional[str] = None, n_jobs: Optional[int] = None) -> pd.DataFrame:
+        if isinstance(data, pd.DataFrame) and by is not None:
+            if column is None:
+                candidates = [col for col in data.select_dtypes(include=[np.number]).columns
+                              if col not in ([by] if isinstance(by, str) else by)]
+                if len(candidates) != 1:
+                    raise ValueError("Należy wskazać kolumnę z wartościami (column)")
+                column = candidates[0]
+            
+            grouped = data.groupby(by, sort=True)
+            codes = grouped.ngroup().to_numpy()
+            valid = codes >= 0
+            codes = codes[valid]
+            values = data[column].to_numpy(dtype=np.float64)[valid]
+            index = grouped.size().index
+        else:
+            if isinstance(data, pd.DataFrame):
+                data = data.select_dtypes(include=[np.number])
+                index = data.columns
+            matrix = np.asarray(data, dtype=np.float64)
+            if matrix.ndim != 2:
+                raise ValueError("Dane bez kluczy grup muszą być dwuwymiarowe")
+            if not isinstance(data, pd.DataFrame):
+                index = pd.RangeIndex(matrix.shape[1])
+            # Każda kolumna to osobna seria
+            values = matrix.T.ravel()
+            codes = np.repeat(np.arange(matrix.shape[1]), matrix.shape[0])
+        
+        n_groups = len(index)
+        if n_groups == 0 or len(values) == 0:
+            raise ValueError("Dane wejściowe nie mogą być puste")
+        
+        if n_jobs is None or n_jobs <= 1 or n_groups < 2:
+            result = _segmented_stats(codes, values, n_groups)
+        else:
+            bounds = np.linspace(0, n_groups, min(n_jobs, n_groups) + 1).astype(int)
+            # Każde zadanie dostaje tylko swój wycinek danych zamiast pełnych tablic
+            order = np.argsort(codes, kind='stable')
+            codes, values = codes[order], values[order]
+            cuts = np.searchsorted(codes, bounds)
+            code_parts = [codes[a:b] - low for a, b, low in zip(cuts[:-1], cuts[1:], bounds[:-1])]
+            value_parts = [values[a:b] for a, b in zip(cuts[:-1], cuts[1:])]
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                parts = list(executor.map(_segmented_stats, code_parts, value_parts, np.diff(bounds)))
+            result = {key: np.concatenate([part[key] for part in parts]) for key in _STATS_KEYS}
+        
+        return pd.DataFrame(result, index=index, columns=list(_STATS_KEYS))
+
+
+class StreamingStats:
+    
+    def __init__(self, k: int = 200, random_state: Optional[int] = None):
+        self.sketch = QuantileSketch(k, random_state)
+        self.min = np.nan
+        self.max = np.nan
+        self._moments = _Moments()
+    
+    @property
+    def count(self) -> int:
+        return self._moments.n
+    
+    def update(self, batch: Union[List, np.ndarray, pd.Series]) -> 'StreamingStats':
+        values = np.asarray(batch, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return self
+        
+        self._moments.merge(_fused_moments(values))
+        self.sketch.update(values)
+        self.min = np.minimum(self.min, values.min()) if self.count > len(values) else values.min()
+        self.max = np.maximum(self.max, values.max()) if self.count > len(values) else values.max()
+        return self
+    
+    def merge(self, other: 'StreamingStats') -> 'StreamingStats':
+        if other.count == 0:
+            return self
+        had_data = self.count > 0
+        self._moments.merge(other._moments)
+        self.sketch.merge(other.sketch)
+        self.min = np.minimum(self.min, other.min) if had_data else other.min
+        self.max = np.maximum(self.max, other.max) if had_data else other.max
+        return self
+    
+    def result(self) -> Dict[str, float]:
+        if self.count == 0:
+            raise ValueError("Dane wejściowe nie mogą być puste")
+        
+        moments = self._moments
+        if moments.has_nan:
+            q25 = median = q75 = np.float64(np.nan)
+        else:
+            q25, median, q75 = self.sketch.quantile([0.25, 0.5, 0.75])
+        
+        return {
+            'count': self.count,
+            'mean': np.float64(moments.mean),
+            'median': np.float64(median),
+            'std': np.sqrt(moments.sample_var),
+            'var': moments.sample_var,
+            'min': np.float64(self.min),
+            'max': np.float64(self.max),
+            'q25': np.float64(q25),
+            'q75': np.float64(q75),
+            'skewness': moments.skewness,
+            'kurtosis': moments.kurtosis
+        }
+    
+    def confidence_interval(self, confidence: float = 0.95) -> Tuple[float, float]:
+        n = self.count
+        if n < 2:
+            raise ValueError("Potrzeba co najmniej 2 punktów danych dla przedziału ufności")
+        
+        mean = np.float64(self._moments.mean)
+        std_err = np.sqrt(self._moments.sample_var / n)
         h = std_err * stats.t.ppf((1 + confidence) / 2, n - 1)
         
         return (mean - h, mean + h)
 
 
-def advanced_mean(data: Union[List, np.ndarray], method: str = 'arithmetic') -> float:
-    data_array = np.array(data)
+def _align_weights(weights: Union[List, np.ndarray], shape: Tuple[int, ...], axis: Optional[int]) -> np.ndarray:
+    weights = np.asarray(weights, dtype=np.float64)
     
-    if len(data_array) == 0:
+    # Wagi 1-D dla macierzy odnoszą się do osi uśredniania (jak w np.average)
+    if axis is not None and weights.ndim == 1 and len(shape) > 1:
+        if len(weights) != shape[axis]:
+            raise ValueError("Kształt wag nie pasuje do danych")
+        weights = weights.reshape([-1 if dim == axis % len(shape) else 1 for dim in range(len(shape))])
+    
+    try:
+        weights = np.broadcast_to(weights, shape)
+    except ValueError:
+        raise ValueError("Kształt wag nie pasuje do danych") from None
+    if np.any(weights < 0):
+        raise ValueError("Wagi nie mogą być ujemne")
+    return weights
+
+
+def advanced_mean(data: Union[List, np.ndarray], method: str = 'arithmetic', axis: Optional[int] = None,
+                  weights: Optional[Union[List, np.ndarray]] = None,
+                  nan_policy: str = 'propagate') -> Union[float, np.ndarray]:
+    data_array = np.array(data, dtype=np.float64)
+    
+    if data_array.size == 0:
         raise ValueError("Dane wejściowe nie mogą być puste")
+    if method not in ('arithmetic', 'geometric', 'harmonic', 'quadratic'):
+        raise ValueError(f"Nieobsługiwana metoda średniej: {method}")
+    if nan_policy not in ('propagate', 'omit', 'raise'):
+        raise ValueError(f"Nieobsługiwana polityka NaN: {nan_policy}")
     
-    if method == 'arithmetic':
-        return np.mean(data_array)
+    nan_mask = np.isnan(data_array)
+    has_nan = nan_mask.any()
+    if has_nan and nan_policy == 'raise':
+        raise ValueError("Dane wejściowe zawierają wartości NaN")
     
-    elif method == 'geometric':
-        if np.any(data_array <= 0):
-            raise ValueError("Średnia geometryczna wymaga wszystkich wartości dodatnich")
-        return stats.gmean(data_array)
+    if method in ('geometric', 'harmonic') and np.any(data_array[~nan_mask] <= 0):
+        name = 'geometryczna' if method == 'geometric' else 'harmoniczna'
+        raise ValueError(f"Średnia {name} wymaga wszystkich wartości dodatnich")
     
+    # Każda średnia to ważona średnia arytmetyczna po przekształceniu f i powrót przez f^-1;
+    # geometryczna liczona przez sumę logarytmów nie przepełnia się dla dużych iloczynów
+    if method == 'geometric':
+        transformed = np.log(data_array)
     elif method == 'harmonic':
-        if np.any(data_array <= 0):
-            raise ValueError("Średnia harmoniczna wymaga wszystkich wartości dodatnich")
-        return stats.hmean(data_array)
+        transformed = np.reciprocal(data_array)
+    elif method == 'quadratic':
+        transformed = np.square(data_array)
+    else:
+        transformed = data_array
+    
+    if weights is None:
+        weights = np.ones_like(data_array) if has_nan and nan_policy == 'omit' else None
+    else:
+        weights = _align_weights(weights, data_array.shape, axis)
+    
+    if has_nan and nan_policy == 'omit':
+        weights = np.where(nan_mask, 0.0, weights)
+        transformed = np.where(nan_mask, 0.0, transformed)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if weights is None:
+            mean = np.mean(transformed, axis=axis)
+        else:
+            mean = np.sum(weights * transformed, axis=axis) / np.sum(weights, axis=axis)
     
+    if method == 'geometric':
+        mean = np.exp(mean)
+    elif method == 'harmonic':
+        mean = np.reciprocal(mean)
     elif method == 'quadratic':
-        return np.sqrt(np.mean(data_array ** 2))
+        mean = np.sqrt(mean)
+    
+    return mean[()] if isinstance(mean, np.ndarray) and mean.ndim == 0 else mean
+
+
+def _dense_ranks(matrix: np.ndarray) -> np.ndarray:
+    # Rangi gęste 0..k-1 w każdej kolumnie (remisy dostają tę samą rangę)
+    order = np.argsort(matrix, axis=0, kind='stable')
+    sorted_values = np.take_along_axis(matrix, order, axis=0)
+    steps = np.vstack([np.zeros((1, matrix.shape[1]), dtype=np.int64),
+                       (sorted_values[1:] != sorted_values[:-1]).cumsum(axis=0)])
+    ranks = np.empty_like(steps)
+    np.put_along_axis(ranks, order, steps, axis=0)
+    return ranks
+
+
+def _tied_pairs(sorted_keys: np.ndarray) -> np.ndarray:
+    # Suma t(t-1)/2 po seriach równych wartości w posortowanych kolumnach
+    positions = np.arange(len(sorted_keys))[:, None]
+    starts = np.ones(sorted_keys.shape, dtype=bool)
+    starts[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    run_start = np.maximum.accumulate(np.where(starts, positions, 0), axis=0)
+    return (positions - run_start).sum(axis=0)
+
+
+def _inversion_plan(n: int, m: int) -> Tuple[int, np.dtype, np.ndarray]:
+    # Rozmiar i typ kluczy wspólne dla wszystkich kolumn bloku; przesunięcia poziomów powstają
+    # dopiero w pętli scalania, więc pamięć to O(m * n), a nie O(m * n * log n)
+    size = max(_INVERSION_BASE_BLOCK, 1 << int(np.ceil(np.log2(max(n, 1)))))
+    stride = 4 * n + 4
+    dtype = np.int32 if m * size * stride < np.iinfo(np.int32).max else np.int64
+    return size, dtype, np.arange(m * size, dtype=dtype)
+
+
+def _count_inversions(columns: np.ndarray, plan: Tuple[int, np.dtype, np.ndarray]) -> np.ndarray:
+    # Liczba par k < l z y[k] > y[l] w każdej kolumnie (wartości całkowite z zakresu 0..n-1)
+    size, dtype, positions = plan
+    n, m = columns.shape
+    stride = 4 * n + 4
+    values = np.full((m, size), n, dtype=dtype)
+    values[:, :n] = columns.T
+    
+    # Najmniejsze bloki: bezpośrednie porównania wszystkich par
+    small = values.reshape(m, -1, _INVERSION_BASE_BLOCK)
+    upper = np.triu(np.ones((_INVERSION_BASE_BLOCK, _INVERSION_BASE_BLOCK), dtype=bool), 1)
+    inversions = ((small[:, :, :, None] > small[:, :, None, :]) & upper).sum(axis=(1, 2, 3))
+    
+    # Wyższe poziomy: po posortowaniu bloku klucz 2*y + strona (lewa=0, prawa=1) element z prawej
+    # połowy na pozycji p ma przed sobą p - j elementów lewej połowy nie większych od niego,
+    # gdzie j to jego numer wśród elementów prawej połowy
+    doubled = 2 * values.ravel()
+    half = _INVERSION_BASE_BLOCK
+    while half < size:
+        width = 2 * half
+        keys = (positions // width) * stride + ((positions // half) & 1)
+        keys += doubled
+        keys.sort()
+        within = np.arange(size, dtype=np.float64) % width
+        passed = (keys & 1).reshape(m, size) @ within
+        correction = (size // width) * (half * half + half * (half - 1) // 2)
+        inversions += correction - passed.astype(np.int64)
+        half *= 2
+    return inversions
+
+
+def _kendall_block(left: np.ndarray, right: np.ndarray) -> np.ndarray:
+    # tau-b dla każdej pary (kolumna left, kolumna right) w O(n log n) na parę;
+    # wejście to rangi gęste z _dense_ranks
+    n = len(left)
+    total = n * (n - 1) // 2
+    right_ties = _tied_pairs(np.sort(right, axis=0))
+    plan = _inversion_plan(n, right.shape[1])
+    block = np.empty((left.shape[1], right.shape[1]))
     
+    for i in range(left.shape[1]):
+        # Klucz (x, y) sortuje po x, a remisy x rozstrzyga rosnącym y
+        keys = np.sort(left[:, i:i + 1] * n + right, axis=0)
+        joint_ties = _tied_pairs(keys)
+        left_ties = _tied_pairs(keys // n)[0]
+        discordant = _count_inversions(keys % n, plan)
+        
+        numerator = total - left_ties - right_ties + joint_ties - 2 * discordant
+        with np.errstate(invalid='ignore', divide='ignore'):
+            block[i] = numerator / np.sqrt(float(total - left_ties)) / np.sqrt((total - right_ties).astype(np.float64))
+    return np.clip(block, -1.0, 1.0)
+
+
+def _kendall_matrix(ranks: np.ndarray, block_size: int, n_jobs: Optional[int]) -> np.ndarray:
+    p = ranks.shape[1]
+    bounds = list(range(0, p, block_size)) + [p]
+    tiles = [(bounds[a], bounds[a + 1], bounds[b], bounds[b + 1])
+             for a in range(len(bounds) - 1) for b in range(a, len(bounds) - 1)]
+    
+    lefts = [ranks[:, i0:i1] for i0, i1, _, _ in tiles]
+    rights = [ranks[:, j0:j1] for _, _, j0, j1 in tiles]
+    if n_jobs is None or n_jobs <= 1 or len(tiles) == 1:
+        parts = [_kendall_block(left, right) for left, right in zip(lefts, rights)]
     else:
-        raise ValueError(f"Nieobsługiwana metoda średniej: {method}")
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            parts = list(executor.map(_kendall_block, lefts, rights))
+    
+    result = np.empty((p, p))
+    for (i0, i1, j0, j1), part in zip(tiles, parts):
+        result[i0:i1, j0:j1] = part
+        result[j0:j1, i0:i1] = part.T
+    # Zgodnie z pandas przekątna Kendalla zawsze wynosi 1
+    np.fill_diagonal(result, 1.0)
+    return result
+
+
+def _standardized_columns(matrix: np.ndarray, dtype: np.dtype) -> Tuple[np.ndarray, np.ndarray]:
+    # Kolumny scentrowane i znormalizowane do długości 1: korelacja Pearsona to Z^T Z.
+    # Centrowanie zawsze w float64 - w float32 duże przesunięcie zjadłoby cyfry znaczące
+    matrix = np.asarray(matrix, dtype=np.float64)
+    centered = matrix - matrix.mean(axis=0)
+    norms = np.sqrt(np.einsum('ij,ij->j', centered, centered))
+    constant = norms <= np.finfo(np.float64).eps * np.sqrt(len(matrix)) * np.abs(matrix).max(axis=0, initial=0)
+    centered /= np.where(constant, 1.0, norms)
+    centered[:, constant] = 0
+    return centered.astype(dtype, copy=False), constant
+
+
+def _gemm_correlation(matrix: np.ndarray, dtype: np.dtype) -> np.ndarray:
+    standardized, constant = _standardized_columns(matrix, dtype)
+    # Jedno mnożenie macierzy - BLAS sam dzieli je na bloki i wątki
+    result = np.clip(standardized.T @ standardized, -1.0, 1.0)
+    np.fill_diagonal(result, 1.0)
+    result[constant, :] = np.nan
+    result[:, constant] = np.nan
+    return result
+
+
+def _kendall_stripe(ranks: np.ndarray, block_size: int, bounds: Tuple[int, int]) -> np.ndarray:
+    left = ranks[:, bounds[0]:bounds[1]]
+    return np.hstack([_kendall_block(left, ranks[:, start:start + block_size])
+                      for start in range(bounds[0], ranks.shape[1], block_size)])
+
+
+def _correlation_stripes(values: np.ndarray, method: str, dtype: np.dtype, block_size: int,
+                         n_jobs: Optional[int]) -> Iterator[Tuple[int, np.ndarray]]:
+    # Pasy wierszy górnego trójkąta macierzy korelacji: wiersze start..start+block_size,
+    # kolumny od start do końca; pamięć O(block_size * p) zamiast O(p^2)
+    p = values.shape[1]
+    bounds = [(start, min(start + block_size, p)) for start in range(0, p, block_size)]
+    
+    if method == 'kendall':
+        worker = partial(_kendall_stripe, _dense_ranks(values), block_size)
+        if n_jobs is None or n_jobs <= 1 or len(bounds) == 1:
+            for bound in bounds:
+                yield bound[0], worker(bound)
+            return
+        
+        # Pula dostaje ograniczoną liczbę pasów naraz, więc w pamięci jest co najwyżej 2 * n_jobs wyników
+        remaining = iter(bounds)
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            pending = deque()
+            while True:
+                while len(pending) < 2 * n_jobs:
+                    bound = next(remaining, None)
+                    if bound is None:
+                        break
+                    pending.append((bound[0], executor.submit(worker, bound)))
+                if not pending:
+                    return
+                start, future = pending.popleft()
+                yield start, future.result()
+    
+    if method == 'spearman':
+        values = stats.rankdata(values, axis=0)
+    standardized, constant = _standardized_columns(values, dtype)
+    for start, end in bounds:
+        stripe = np.clip(standardized[:, start:end].T @ standardized[:, start:], -1.0, 1.0)
+        stripe[:, constant[start:]] = np.nan
+        stripe[constant[start:end], :] = np.nan
+        yield start, stripe
+
+
+def _stripe_strength(stripe: np.ndarray) -> np.ndarray:
+    strength = np.abs(stripe)
+    # Pary kolumny z samą sobą i pary nieokreślone (NaN) nigdy nie trafiają do wyniku
+    rows = np.arange(stripe.shape[0])
+    strength[rows, rows] = -np.inf
+    strength[np.isnan(strength)] = -np.inf
+    return strength
+
+
+def _merge_top_k(best: Tuple[np.ndarray, np.ndarray, np.ndarray], rows: slice, strength: np.ndarray,
+                 partners: np.ndarray, correlations: np.ndarray) -> None:
+    # Dołącza kandydatów do bieżących k najsilniejszych partnerów wybranych wierszy
+    best_strength, best_partner, best_value = best
+    k = best_strength.shape[1]
+    strength = np.hstack([best_strength[rows], strength])
+    partners = np.hstack([best_partner[rows], np.broadcast_to(partners, strength[:, k:].shape)])
+    correlations = np.hstack([best_value[rows], correlations])
+    keep = np.argpartition(-strength, k - 1, axis=1)[:, :k]
+    best_strength[rows] = np.take_along_axis(strength, keep, axis=1)
+    best_partner[rows] = np.take_along_axis(partners, keep, axis=1)
+    best_value[rows] = np.take_along_axis(correlations, keep, axis=1)
 
 
-def correlation_matrix(data: pd.DataFrame, method: str = 'pearson') -> pd.DataFrame:
+def _sparse_correlation(values: np.ndarray, columns: pd.Index, method: str, dtype: np.dtype,
+                        block_size: int, n_jobs: Optional[int], top_k: Optional[int],
+                        threshold: Optional[float], output: str) -> Union[pd.DataFrame, sparse.coo_matrix]:
+    if top_k is None and threshold is None:
+        raise ValueError("Tryb rzadki wymaga podania top_k lub threshold")
+    if top_k is not None and top_k < 1:
+        raise ValueError("Parametr top_k musi być dodatni")
+    if np.isnan(values).any():
+        raise ValueError("Tryb rzadki nie obsługuje brakujących wartości")
+    
+    p = values.shape[1]
+    k = min(top_k, p - 1) if top_k is not None else 0
+    minimum = threshold if threshold is not None else -np.inf
+    # Liczony jest tylko górny trójkąt; para (i, j) z pasa wiersza i jest też kandydatem dla
+    # wiersza j, więc wiersze pasa są kompletne po jego przetworzeniu (pamięć O(p * k))
+    best = (np.full((p, k), -np.inf), np.zeros((p, k), dtype=np.int64), np.zeros((p, k), dtype=dtype))
+    
+    sources, targets, correlations = [], [], []
+    for start, stripe in _correlation_stripes(values, method, dtype, block_size, n_jobs):
+        end = start + stripe.shape[0]
+        strength = _stripe_strength(stripe)
+        stripe = stripe.astype(dtype, copy=False)
+        
+        if top_k is None:
+            # Bez top_k każdą parę zapisujemy raz (target > source)
+            keep = np.triu(strength >= minimum, 1)
+            source, target = np.nonzero(keep)
+            sources.append(start + source)
+            targets.append(start + target)
+            correlations.append(stripe[source, target])
+            continue
+        if k < 1:
+            continue
+        
+        _merge_top_k(best, slice(start, end), strength, np.arange(start, p), stripe)
+        if end < p:
+            _merge_top_k(best, slice(end, p), strength[:, end - start:].T, np.arange(start, end),
+                         stripe[:, end - start:].T)
+        
+        keep = best[0][start:end] >= minimum
+        keep &= np.isfinite(best[0][start:end])
+        source = np.broadcast_to(np.arange(start, end)[:, None], keep.shape)[keep]
+        sources.append(source)
+        targets.append(best[1][start:end][keep])
+        correlations.append(best[2][start:end][keep])
+    
+    source = np.concatenate(sources) if sources else np.empty(0, dtype=np.int64)
+    target = np.concatenate(targets) if targets else np.empty(0, dtype=np.int64)
+    correlation = np.concatenate(correlations) if correlations else np.empty(0, dtype=dtype)
+    
+    if output == 'coo':
+        return sparse.coo_matrix((correlation, (source, target)), shape=(len(columns), len(columns)))
+    
+    order = np.lexsort((-np.abs(correlation), source))
+    return pd.DataFrame({
+        'source': columns[source[order]],
+        'target': columns[target[order]],
+        'correlation': correlation[order]
+    })
+
+
+def correlation_matrix(data: pd.DataFrame, method: str = 'pearson', dtype: Union[str, np.dtype] = np.float64,
+                       block_size: int = 64, n_jobs: Optional[int] = None, top_k: Optional[int] = None,
+                       threshold: Optional[float] = None,
+                       output: Optional[str] = None) -> Union[pd.DataFrame, sparse.coo_matrix]:
     if not isinstance(data, pd.DataFrame):
         raise ValueError("Dane wejściowe muszą być pandas DataFrame")
     
@@ -85,31 +1070,444 @@ def correlation_matrix(data: pd.DataFrame, method: str = 'pearson') -> pd.DataFr
     
     if numeric_data.empty:
         raise ValueError("DataFrame musi zawierać kolumny numeryczne")
+    if method not in ['pearson', 'spearman', 'kendall']:
+        raise ValueError(f"Nieobsługiwana metoda korelacji: {method}")
+    
+    dtype = np.dtype(dtype)
+    if dtype not in (np.float32, np.float64):
+        raise ValueError(f"Nieobsługiwany typ obliczeń: {dtype}")
+    if block_size < 1:
+        raise ValueError("Rozmiar bloku musi być dodatni")
     
-    if method in ['pearson', 'spearman', 'kendall']:
-        return numeric_data.corr(method=method)
+    if output is None:
+        output = 'dense' if top_k is None and threshold is None else 'edges'
+    if output not in ('dense', 'edges', 'coo'):
+        raise ValueError(f"Nieobsługiwany format wyniku: {output}")
+    
+    values = numeric_data.to_numpy(dtype=np.float64)
+    if output != 'dense':
+        return _sparse_correlation(values, numeric_data.columns, method, dtype, block_size, n_jobs,
+                                   top_k, threshold, output)
+    if top_k is not None or threshold is not None:
+        raise ValueError("Parametry top_k i threshold wymagają wyniku 'edges' lub 'coo'")
+    
+    # Brakujące wartości wymagają korelacji parami po wspólnych obserwacjach - zostawiamy to pandas
+    if np.isnan(values).any() or len(values) < 2:
+        return numeric_data.corr(method=method).astype(dtype)
+    
+    if method == 'pearson':
+        result = _gemm_correlation(values, dtype)
+    elif method == 'spearman':
+        result = _gemm_correlation(stats.rankdata(values, axis=0), dtype)
     else:
-        raise ValueError(f"Nieobsługiwana metoda korelacji: {method}")
+        result = _kendall_matrix(_dense_ranks(values), block_size, n_jobs)
+    
+    return pd.DataFrame(result.astype(dtype, copy=False), index=numeric_data.columns, columns=numeric_data.columns)
+
+
+class CorrelationAccumulator:
+    
+    def __init__(self, method: str = 'pearson', k: int = 200, random_state: Optional[int] = None):
+        if method not in ('pearson', 'spearman'):
+            raise ValueError(f"Nieobsługiwana metoda korelacji: {method}")
+        self.method = method
+        self.k = k
+        self.random_state = random_state
+        self.columns = None
+        self.count = 0
+        self.mean = None
+        self.comoment = None
+        self.sketches = None
+    
+    def _prepare(self, chunk: Union[pd.DataFrame, np.ndarray]) -> np.ndarray:
+        if isinstance(chunk, pd.DataFrame):
+            numeric = chunk.select_dtypes(include=[np.number])
+            columns = numeric.columns
+            values = numeric.to_numpy(dtype=np.float64)
+        else:
+            values = np.asarray(chunk, dtype=np.float64)
+            if values.ndim != 2:
+                raise ValueError("Dane wejściowe muszą być macierzą dwuwymiarową")
+            columns = pd.RangeIndex(values.shape[1])
+        
+        if self.columns is None:
+            if len(columns) == 0:
+                raise ValueError("DataFrame musi zawierać kolumny numeryczne")
+            self.columns = columns
+            self.mean = np.zeros(len(columns))
+            self.comoment = np.zeros((len(columns), len(columns)))
+            if self.method == 'spearman':
+                self.sketches = [QuantileSketch(self.k, None if self.random_state is None else self.random_state + i)
+                                 for i in range(len(columns))]
+        elif not columns.equals(self.columns):
+            raise ValueError("Kolumny porcji nie zgadzają się z poprzednimi danymi")
+        
+        # Wiersze z brakami pomijamy w całości, aby wszystkie pary liczyły się z tych samych obserwacji
+        return values[~np.isnan(values).any(axis=1)]
+    
+    def _merge_moments(self, count: int, mean: np.ndarray, comoment: np.ndarray) -> None:
+        # Łączenie momentów drugiego rzędu (Chan i in.)
+        total = self.count + count
+        delta = mean - self.mean
+        self.comoment += comoment + np.outer(delta, delta) * (self.count * count / total)
+        self.mean += delta * (count / total)
+        self.count = total
+    
+    def update(self, chunk: Union[pd.DataFrame, np.ndarray]) -> 'CorrelationAccumulator':
+        values = self._prepare(chunk)
+        if len(values) == 0:
+            return self
+        
+        if self.method == 'spearman':
+            # Przybliżone rangi: dystrybuanta ze szkicu zaktualizowanego o bieżącą porcję
+            for col, sketch in enumerate(self.sketches):
+                sketch.update(values[:, col])
+            values = np.column_stack([sketch.cdf(values[:, col]) for col, sketch in enumerate(self.sketches)])
+        
+        chunk_mean = values.mean(axis=0)
+        centered = values - chunk_mean
+        self._merge_moments(len(values), chunk_mean, centered.T @ centered)
+        return self
+    
+    def merge(self, other: 'CorrelationAccumulator') -> 'CorrelationAccumulator':
+        if other.method != self.method:
+            raise ValueError("Nie można łączyć akumulatorów o różnych metodach")
+        if other.count == 0:
+            return self
+        if self.columns is None:
+            self.columns = other.columns
+            self.mean = np.zeros(len(other.columns))
+            self.comoment = np.zeros((len(other.columns), len(other.columns)))
+            if self.method == 'spearman':
+                self.sketches = [QuantileSketch(self.k) for _ in other.columns]
+        elif not other.columns.equals(self.columns):
+            raise ValueError("Kolumny porcji nie zgadzają się z poprzednimi danymi")
+        
+        if self.method == 'spearman':
+            for sketch, other_sketch in zip(self.sketches, other.sketches):
+                sketch.merge(other_sketch)
+        self._merge_moments(other.count, other.mean, other.comoment)
+        return self
+    
+    def result(self) -> pd.DataFrame:
+        if self.count < 2:
+            raise ValueError("Potrzeba co najmniej 2 wierszy do obliczenia korelacji")
+        
+        scale = np.sqrt(np.diag(self.comoment))
+        constant = scale <= np.finfo(np.float64).eps * np.abs(self.mean) * self.count
+        with np.errstate(invalid='ignore', divide='ignore'):
+            result = np.clip(self.comoment / np.outer(scale, scale), -1.0, 1.0)
+        np.fill_diagonal(result, 1.0)
+        result[constant, :] = np.nan
+        result[:, constant] = np.nan
+        return pd.DataFrame(result, index=self.columns, columns=self.columns)
+
+
+def _ema_filter(values: np.ndarray, alpha: float, previous: Optional[np.ndarray] = None) -> np.ndarray:
+    # y[i] = alpha * x[i] + (1 - alpha) * y[i-1] jako filtr IIR pierwszego rzędu;
+    # bez poprzedniej wartości y[0] = x[0]
+    b = np.array([alpha], dtype=values.dtype)
+    a = np.array([1.0, alpha - 1.0], dtype=values.dtype)
+    start = values[:1] if previous is None else previous
+    result, _ = signal.lfilter(b, a, values, axis=0, zi=(1.0 - alpha) * start)
+    return result
 
 
-def moving_average(data: Union[List, np.ndarray], window: int, method: str = 'simple') -> np.ndarray:
+def _exponential_moving_average(data_array: np.ndarray, window: int) -> np.ndarray:
+    alpha = 2.0 / (window + 1)
+    dtype = np.float32 if data_array.dtype == np.float32 else np.float64
+    values = data_array.astype(dtype, copy=False)
+    
+    missing = np.isnan(values)
+    if not missing.any():
+        return _ema_filter(values, alpha)
+    
+    # NaN są pomijane: filtr działa na obecnych wartościach, a luki dostają ostatnią średnią
+    columns = values.reshape(len(values), -1)
+    missing = missing.reshape(len(values), -1)
+    result = np.full(columns.shape, np.nan, dtype=dtype)
+    positions = np.arange(len(values))
+    
+    for col in range(columns.shape[1]):
+        present = ~missing[:, col]
+        if not present.any():
+            continue
+        filtered = np.full(len(values), np.nan, dtype=dtype)
+        filtered[present] = _ema_filter(columns[present, col], alpha)
+        last_seen = np.maximum.accumulate(np.where(present, positions, -1))
+        result[:, col] = np.where(last_seen >= 0, filtered[np.maximum(last_seen, 0)], np.nan)
+    
+    return result.reshape(values.shape)
+
+
+def _compensated_window_sums(values: np.ndarray, window: int) -> np.ndarray:
+    # Sumy prefiksowe z korekcją TwoSum: błąd zaokrąglenia każdego kroku cumsum jest
+    # liczony wektorowo i sumowany osobno, więc różnice odległych prefiksów nie tracą cyfr
+    prefix = np.zeros(len(values) + 1)
+    np.cumsum(values, out=prefix[1:])
+    previous, current = prefix[:-1], prefix[1:]
+    
+    added = current - previous
+    error = np.subtract(previous, current - added)
+    error += np.subtract(values, added, out=added)
+    
+    correction = np.zeros(len(values) + 1)
+    np.cumsum(error, out=correction[1:])
+    
+    sums = prefix[window:] - prefix[:-window]
+    sums += correction[window:]
+    sums -= correction[:-window]
+    return sums
+
+
+def _simple_moving_average(data_array: np.ndarray, window: int, backend: str) -> np.ndarray:
+    if backend == 'auto':
+        # Splot bezpośredni O(n·w) wygrywa tylko dla małych okien; FFT przegrywa z sumami
+        # prefiksowymi dla każdego n, więc zostaje dostępne jedynie jawnie.
+        # NaN/inf w sumach prefiksowych zepsułyby wszystkie kolejne okna
+        if window <= _SMA_DIRECT_MAX_WINDOW or not np.isfinite(data_array).all():
+            backend = 'direct'
+        else:
+            backend = 'cumsum'
+    
+    if backend == 'direct':
+        return np.convolve(data_array, np.ones(window)/window, mode='valid')
+    elif backend == 'cumsum':
+        return _compensated_window_sums(data_array.astype(np.float64, copy=False), window) / window
+    elif backend == 'fft':
+        return signal.fftconvolve(data_array.astype(np.float64, copy=False), np.ones(window)/window, mode='valid')
+    else:
+        raise ValueError(f"Nieobsługiwany backend średniej ruchomej: {backend}")
+
+
+def moving_average(data: Union[List, np.ndarray], window: int, method: str = 'simple',
+                   backend: str = 'auto') -> np.ndarray:
     data_array = np.array(data)
     
     if window <= 0 or window > len(data_array):
         raise ValueError("Nieprawidłowy rozmiar okna")
     
     if method == 'simple':
-        return np.convolve(data_array, np.ones(window)/window, mode='valid')
+        return _simple_moving_average(data_array, window, backend)
     
     elif method == 'exponential':
-        alpha = 2.0 / (window + 1)
-        result = np.zeros(len(data_array))
-        result[0] = data_array[0]
+        return _exponential_moving_average(data_array, window)
+    
+    else:
+        raise ValueError(f"Nieobsługiwana metoda średniej ruchomej: {method}")
+
+
+class RollingWindow(ABC):
+    
+    def __init__(self, window: int):
+        if window <= 0:
+            raise ValueError("Nieprawidłowy rozmiar okna")
+        self.window = window
+        self.count = 0
+        self.value = np.nan
+    
+    def update(self, values: Union[float, List, np.ndarray]) -> np.ndarray:
+        values = np.atleast_1d(np.asarray(values, dtype=np.float64)).ravel()
+        if len(values) == 0:
+            return values
         
-        for i in range(1, len(data_array)):
-            result[i] = alpha * data_array[i] + (1 - alpha) * result[i-1]
+        if len(values) == 1:
+            result = self._push(values[0])
+            result = np.array([result]) if result is not None else np.empty(0)
+        else:
+            result = self._extend(values)
         
+        self.count += len(values)
+        if len(result):
+            self.value = result[-1]
         return result
     
-    else:
-        raise ValueError(f"Nieobsługiwana metoda średniej ruchomej: {method}")
+    @abstractmethod
+    def _push(self, value: float) -> Optional[float]:
+        ...
+    
+    def _extend(self, values: np.ndarray) -> np.ndarray:
+        outputs = [self._push(value) for value in values]
+        return np.array([output for output in outputs if output is not None])
+
+
+class _RingBuffer:
+    
+    def __init__(self, size: int):
+        self.data = np.zeros(size)
+        self.head = 0
+        self.filled = 0
+        # Liczba wartości NaN/inf w buforze
+        self.nonfinite = 0
+    
+    @property
+    def full(self) -> bool:
+        return self.filled == len(self.data)
+    
+    def push(self, value: float) -> Optional[float]:
+        evicted = self.data[self.head] if self.full else None
+        self.nonfinite += (not np.isfinite(value)) - (evicted is not None and not np.isfinite(evicted))
+        self.data[self.head] = value
+        self.head = (self.head + 1) % len(self.data)
+        self.filled = min(self.filled + 1, len(self.data))
+        return evicted
+    
+    def ordered(self) -> np.ndarray:
+        if not self.full:
+            return self.data[:self.filled]
+        return np.concatenate([self.data[self.head:], self.data[:self.head]])
+    
+    def replace(self, values: np.ndarray) -> None:
+        kept = values[-len(self.data):]
+        self.data[:len(kept)] = kept
+        self.filled = len(kept)
+        self.head = len(kept) % len(self.data)
+        self.nonfinite = int(np.count_nonzero(~np.isfinite(kept)))
+
+
+class RollingMean(RollingWindow):
+    
+    def __init__(self, window: int):
+        super().__init__(window)
+        self._buffer = _RingBuffer(window)
+        self._sum = 0.0
+        self._pushes_since_resync = 0
+    
+    def _push(self, value: float) -> Optional[float]:
+        evicted = self._buffer.push(value)
+        if self._buffer.nonfinite:
+            # NaN/inf w oknie: wynik jak w splocie, a suma zostanie przeliczona po jego opuszczeniu
+            self._pushes_since_resync = self.window
+            return self._buffer.data.sum() / self.window if self._buffer.full else None
+        self._sum += value - (evicted if evicted is not None else 0.0)
+        
+        # Okresowe przeliczenie sumy usuwa dryf błędów zaokrągleń (koszt O(1) zamortyzowany)
+        self._pushes_since_resync += 1
+        if self._pushes_since_resync >= self.window:
+            self._sum = self._buffer.data[:self._buffer.filled].sum()
+            self._pushes_since_resync = 0
+        
+        return self._sum / self.window if self._buffer.full else None
+    
+    def _extend(self, values: np.ndarray) -> np.ndarray:
+        extended = np.concatenate([self._buffer.ordered()[-(self.window - 1):] if self.window > 1 else [], values])
+        self._buffer.replace(extended)
+        self._sum = self._buffer.data[:self._buffer.filled].sum()
+        self._pushes_since_resync = 0
+        if len(extended) < self.window:
+            return np.empty(0)
+        return moving_average(extended, self.window, method='simple')
+
+
+class RollingWeightedMean(RollingWindow):
+    
+    def __init__(self, window: int):
+        super().__init__(window)
+        self._buffer = _RingBuffer(window)
+        self._weights = np.arange(1, window + 1, dtype=np.float64)
+        self._norm = self._weights.sum()
+        self._sum = 0.0
+        self._weighted_sum = 0.0
+        self._pushes_since_resync = 0
+    
+    def _resync(self) -> None:
+        ordered = self._buffer.ordered()
+        self._sum = ordered.sum()
+        self._weighted_sum = ordered @ self._weights[-len(ordered):] if len(ordered) else 0.0
+        self._pushes_since_resync = 0
+    
+    def _push(self, value: float) -> Optional[float]:
+        # Wagi liniowe 1..w (najnowsza próbka ma wagę w): nowa suma ważona = stara + w*x - suma okna
+        was_full = self._buffer.full
+        evicted = self._buffer.push(value)
+        if self._buffer.nonfinite:
+            self._pushes_since_resync = self.window
+            if not self._buffer.full:
+                return None
+            return self._buffer.ordered() @ self._weights / self._norm
+        self._pushes_since_resync += 1
+        
+        if not was_full or self._pushes_since_resync >= self.window:
+            self._resync()
+        else:
+            self._weighted_sum += self.window * value - self._sum
+            self._sum += value - evicted
+        
+        return self._weighted_sum / self._norm if self._buffer.full else None
+    
+    def _extend(self, values: np.ndarray) -> np.ndarray:
+        extended = np.concatenate([self._buffer.ordered()[-(self.window - 1):] if self.window > 1 else [], values])
+        self._buffer.replace(extended)
+        self._resync()
+        if len(extended) < self.window:
+            return np.empty(0)
+        return np.convolve(extended, self._weights[::-1] / self._norm, mode='valid')
+
+
+class RollingEMA(RollingWindow):
+    
+    def __init__(self, window: Optional[int] = None, alpha: Optional[float] = None):
+        if window is not None and window < 1:
+            raise ValueError("Nieprawidłowy rozmiar okna")
+        if alpha is None:
+            if window is None:
+                raise ValueError("Należy podać okno lub współczynnik alpha")
+            alpha = 2.0 / (window + 1)
+        elif not 0 < alpha <= 1:
+            raise ValueError("Współczynnik alpha musi należeć do przedziału (0, 1]")
+        super().__init__(window if window is not None else 1)
+        self.alpha = alpha
+    
+    def _push(self, value: float) -> Optional[float]:
+        if np.isnan(value):
+            return self.value
+        if np.isnan(self.value):
+            return value
+        return self.alpha * value + (1 - self.alpha) * self.value
+    
+    def _extend(self, values: np.ndarray) -> np.ndarray:
+        present = ~np.isnan(values)
+        result = np.full(len(values), self.value)
+        if not present.any():
+            return result
+        
+        previous = None if np.isnan(self.value) else np.array([self.value])
+        filtered = np.full(len(values), np.nan)
+        filtered[present] = _ema_filter(values[present], self.alpha, previous)
+        
+        positions = np.arange(len(values))
+        last_seen = np.maximum.accumulate(np.where(present, positions, -1))
+        return np.where(last_seen >= 0, filtered[np.maximum(last_seen, 0)], self.value)
+
+
+class RollingMedian(RollingWindow):
+    
+    def __init__(self, window: int):
+        super().__init__(window)
+        self._order = deque()
+        self._sorted = []
+        self._nan_count = 0
+    
+    def _push(self, value: float) -> Optional[float]:
+        # Wyszukiwanie binarne jest O(log w), ale insort i del przesuwają listę: O(w) na próbkę
+        # (memmove w C, tanie dla typowych okien). NaN nie trafia do posortowanej listy.
+        if len(self._order) == self.window:
+            oldest = self._order.popleft()
+            if np.isnan(oldest):
+                self._nan_count -= 1
+            else:
+                del self._sorted[bisect.bisect_left(self._sorted, oldest)]
+        self._order.append(value)
+        if np.isnan(value):
+            self._nan_count += 1
+        else:
+            bisect.insort(self._sorted, value)
+        
+        if len(self._order) < self.window:
+            return None
+        if self._nan_count:
+            return np.nan
+        middle = self.window // 2
+        if self.window % 2:
+            return self._sorted[middle]
+        return (self._sorted[middle - 1] + self._sorted[middle]) / 2
@@ -1,9 +1,45 @@
 import re
 import string
-from typing import List, Dict, Set, Union, Optional, Tuple
-from collections import Counter
+import os
+import json
+import math
+from array import array
+from typing import List, Dict, Set, Union, Optional, Tuple, Iterable, Iterator, Callable
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
 import unicodedata
 
+import numpy as np
+
+
+_DIGITS_RE = re.compile(r'\d+')
+_PUNCTUATION_TABLE = str.maketrans('', '', string.punctuation)
+
+
+def _preprocess(text: str, remove_punctuation: bool, remove_numbers: bool, to_lowercase: bool) -> str:
+    if not isinstance(text, str):
+        text = str(text)
+    
+    text = unicodedata.normalize('NFKD', text)
+    
+    if to_lowercase:
+        text = text.lower()
+    
+    if remove_punctuation:
+        text = text.translate(_PUNCTUATION_TABLE)
+    if remove_numbers:
+        # Cyfry Unicode (\d) - tabela translacji wymagałaby przejrzenia wszystkich punktów kodowych
+        text = _DIGITS_RE.sub('', text)
+    
+    # split() bez argumentu dzieli po tych samych białych znakach co \s i od razu je przycina
+    return ' '.join(text.split())
+
+
+def _preprocess_chunk(options: Tuple[bool, bool, bool], texts: List[str]) -> List[str]:
+    return [_preprocess(text, *options) for text in texts]
+
 
 class TextAnalyzer:
     
@@ -11,6 +47,7 @@ class TextAnalyzer:
         self.language = language
         self.stop_words = self._get_basic_stop_words()
         self.processed_texts = []
+        self.index = CorpusIndex(tokenizer=self._index_tokens)
     
     def _get_basic_stop_words(self) -> Set[str]:
         polish_stops = {
@@ -24,25 +61,61 @@ class TextAnalyzer:
     
     def preprocess_text(self, text: str, remove_punctuation: bool = True, 
                        remove_numbers: bool = False, to_lowercase: bool = True) -> str:
-        if not isinstance(text, str):
-            text = str(text)
-        
-        text = unicodedata.normalize('NFKD', text)
-        
-        if to_lowercase:
-            text = text.lower()
-        
-        text = re.sub(r'\s+', ' ', text).strip()
-        
-        if remove_punctuation:
-            text = text.translate(str.maketrans('', '', string.punctuation))
-        
-        if remove_numbers:
-            text = re.sub(r'\d+', '', text)
+        return _preprocess(text, remove_punctuation, remove_numbers, to_lowercase)
+    
+    def preprocess_stream(self, texts: Iterable[str], remove_punctuation: bool = True,
+                          remove_numbers: bool = False, to_lowercase: bool = True,
+                          n_jobs: Optional[int] = None, chunksize: int = 1000) -> Iterator[str]:
+        if chunksize < 1:
+            raise ValueError("Rozmiar porcji musi być dodatni")
+        options = (remove_punctuation, remove_numbers, to_lowercase)
         
-        text = re.sub(r'\s+', ' ', text).strip()
+        if n_jobs is None or n_jobs <= 1:
+            for text in texts:
+                yield _preprocess(text, *options)
+            return
         
-        return text
+        # Pula dostaje ograniczoną liczbę porcji naraz, więc wejście czytane jest leniwie
+        texts = iter(texts)
+        worker = partial(_preprocess_chunk, options)
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            pending = deque()
+            while True:
+                while len(pending) < 2 * n_jobs:
+                    chunk = list(islice(texts, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(executor.submit(worker, chunk))
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+    
+    def preprocess_batch(self, texts: Iterable[str], remove_punctuation: bool = True,
+                         remove_numbers: bool = False, to_lowercase: bool = True,
+                         n_jobs: Optional[int] = None, chunksize: int = 1000) -> List[str]:
+        return list(self.preprocess_stream(texts, remove_punctuation, remove_numbers, to_lowercase,
+                                           n_jobs, chunksize))
+    
+    def _normalized_stop_words(self) -> Set[str]:
+        # Teksty przechodzą przez NFKD, więc słowa z diakrytykami ('się', 'że') muszą też
+        return {self.preprocess_text(word) for word in self.stop_words}
+    
+    def _index_tokens(self, text: str) -> List[str]:
+        stop_words = self._normalized_stop_words()
+        return [word for word in self.preprocess_text(text).split() if word not in stop_words]
+    
+    def index_documents(self, texts: Iterable[str], n_jobs: Optional[int] = None,
+                        chunksize: int = 1000) -> List[int]:
+        stop_words = self._normalized_stop_words()
+        doc_ids = []
+        for processed in self.preprocess_stream(texts, n_jobs=n_jobs, chunksize=chunksize):
+            self.processed_texts.append(processed)
+            doc_ids.append(self.index.add_document([word for word in processed.split()
+                                                    if word not in stop_words]))
+        return doc_ids
+    
+    def find_similar(self, text: str, top_n: int = 10, method: str = 'jaccard') -> List[Tuple[int, float]]:
+        return self.index.similar(text, top_n=top_n, method=method)
     
     def extract_features(self, text: str) -> Dict[str, Union[int, float]]:
         words = text.split()
@@ -61,21 +134,40 @@ class TextAnalyzer:
         return features
 
 
-def clean_text(text: str, aggressive: bool = False) -> str:
+_URL_RE = re.compile(r'(?:http|www)\S+')
+# Jeden przebieg zamiast łańcucha re.sub: wzmianki/hashtagi są dopasowywane bez grupy (usuwane),
+# słowa trafiają do grupy, a wszystko inne rozdziela słowa
+_TOKEN_RE = re.compile(r'[@#]\w+|(\w+)')
+# W trybie agresywnym białe znaki spoza ASCII były usuwane razem z innymi znakami non-ASCII
+# i sklejały sąsiednie fragmenty, także ponad usuniętą wzmianką
+_GLUED_TOKEN_RE = re.compile(r'((?:[@#]\w+|\w+|[^\S\x00-\x7F]+)+)')
+_MENTION_RE = re.compile(r'[@#]\w+')
+_NON_ASCII_SPACE_RE = re.compile(r'[^\S\x00-\x7F]')
+_ASCII_DIGITS_TABLE = str.maketrans('', '', string.digits)
+
+
+def clean_text(text: str, aggressive: bool = False, return_tokens: bool = False) -> Union[str, List[str]]:
     if not isinstance(text, str):
         text = str(text)
     
-    text = re.sub(r'http\S+|www\S+|https\S+', '', text, flags=re.MULTILINE)  # Usuwanie URL
-    text = re.sub(r'@\w+|#\w+', '', text)  # Usuwanie wzmianek i hashtagów
-    text = re.sub(r'[^\w\s]', ' ', text)  # Usuwanie znaków specjalnych
+    # Adresy URL trzeba usunąć przed podziałem na słowa (kończą się dopiero na białym znaku);
+    # dokument bez nich przechodzi jedno skanowanie
+    if 'http' in text or 'www' in text:
+        text = _URL_RE.sub('', text)
     
-    if aggressive:
-        text = re.sub(r'\d+', '', text)  # Usuwanie liczb
-        text = re.sub(r'[^\x00-\x7F]+', '', text)  # Usuwanie znaków non-ASCII
+    if not aggressive:
+        tokens = [token for token in _TOKEN_RE.findall(text) if token]
+        return tokens if return_tokens else ' '.join(tokens)
     
-    text = re.sub(r'\s+', ' ', text).strip()
-    
-    return text
+    if text.isascii() or not _NON_ASCII_SPACE_RE.search(text):
+        text = ' '.join(token for token in _TOKEN_RE.findall(text) if token)
+    else:
+        text = ' '.join(_GLUED_TOKEN_RE.findall(text))
+        if '@' in text or '#' in text:
+            text = _MENTION_RE.sub('', text)
+    # Usuwanie znaków non-ASCII i liczb na gotowym wyniku; puste słowa znikają przy split()
+    tokens = text.encode('ascii', 'ignore').decode('ascii').translate(_ASCII_DIGITS_TABLE).split()
+    return tokens if return_tokens else ' '.join(tokens)
 
 
 def extract_keywords(text: str, top_n: int = 10, min_length: int = 3) -> List[Tuple[str, int]]:
@@ -87,8 +179,7 @@ def extract_keywords(text: str, top_n: int = 10, min_length: int = 3) -> List[Tu
         'w', 'we', 'z', 'za', 'że', 'przez', 'przy', 'także', 'tylko'
     }
     
-    cleaned_text = clean_text(text.lower())
-    words = cleaned_text.split()
+    words = clean_text(text.lower(), return_tokens=True)
     
     filtered_words = [
         word for word in words 
@@ -101,8 +192,8 @@ def extract_keywords(text: str, top_n: int = 10, min_length: int = 3) -> List[Tu
 
 
 def text_similarity(text1: str, text2: str, method: str = 'jaccard') -> float:
-    words1 = set(clean_text(text1.lower()).split())
-    words2 = set(clean_text(text2.lower()).split())
+    words1 = set(clean_text(text1.lower(), return_tokens=True))
+    words2 = set(clean_text(text2.lower(), return_tokens=True))
     
     if method == 'jaccard':
         intersection = len(words1.intersection(words2))
@@ -125,3 +216,222 @@ def text_similarity(text1: str, text2: str, method: str = 'jaccard') -> float:
     
     else:
         raise ValueError(f"Nieobsługiwana metoda podobieństwa: {method}")
+
+
+def _default_index_tokens(text: str) -> List[str]:
+    return clean_text(text.lower(), return_tokens=True)
+
+
+class CorpusIndex:
+    
+    _ARRAYS = ('postings_indptr', 'postings_docs', 'postings_freqs', 'documents_indptr', 'documents_terms')
+    
+    def __init__(self, tokenizer: Optional[Callable[[str], List[str]]] = None):
+        self.tokenizer = tokenizer or _default_index_tokens
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self._document_frequency = array('q')
+        self._document_lengths = array('i')
+        self._removed: Set[int] = set()
+        
+        # Część zamrożona w formacie CSR (po wczytaniu może być mapowana z dysku)
+        self._postings_indptr = np.zeros(1, dtype=np.int64)
+        self._postings_docs = np.empty(0, dtype=np.int32)
+        self._postings_freqs = np.empty(0, dtype=np.int32)
+        self._documents_indptr = np.zeros(1, dtype=np.int64)
+        self._documents_terms = np.empty(0, dtype=np.int32)
+        
+        # Przyrost od ostatniego zamrożenia: listy postingów jako zwarte tablice array
+        self._new_postings: Dict[int, Tuple[array, array]] = {}
+        self._new_documents: List[array] = []
+    
+    @property
+    def n_documents(self) -> int:
+        return len(self._document_lengths) - len(self._removed)
+    
+    def _tokens(self, text: Union[str, List[str]]) -> List[str]:
+        return list(text) if isinstance(text, (list, tuple)) else self.tokenizer(text)
+    
+    def _document_terms(self, doc_id: int) -> np.ndarray:
+        frozen = len(self._documents_indptr) - 1
+        if doc_id < frozen:
+            return np.asarray(self._documents_terms[self._documents_indptr[doc_id]:self._documents_indptr[doc_id + 1]])
+        return np.asarray(self._new_documents[doc_id - frozen], dtype=np.int32)
+    
+    def add_document(self, text: Union[str, List[str]]) -> int:
+        doc_id = len(self._document_lengths)
+        counts = Counter(self._tokens(text))
+        
+        term_ids = array('i')
+        for term, count in counts.items():
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                term_id = self.vocabulary[term] = len(self.terms)
+                self.terms.append(term)
+                self._document_frequency.append(0)
+            postings = self._new_postings.get(term_id)
+            if postings is None:
+                postings = self._new_postings[term_id] = (array('i'), array('i'))
+            postings[0].append(doc_id)
+            postings[1].append(count)
+            self._document_frequency[term_id] += 1
+            term_ids.append(term_id)
+        
+        self._new_documents.append(array('i', sorted(term_ids)))
+        self._document_lengths.append(len(term_ids))
+        return doc_id
+    
+    def add_documents(self, texts: Iterable[Union[str, List[str]]]) -> List[int]:
+        return [self.add_document(text) for text in texts]
+    
+    def remove_document(self, doc_id: int) -> None:
+        if not 0 <= doc_id < len(self._document_lengths) or doc_id in self._removed:
+            raise ValueError(f"Nieznany dokument: {doc_id}")
+        # Postingi usuwanego dokumentu zostają do compact(); zapytania je odfiltrowują
+        for term_id in self._document_terms(doc_id):
+            self._document_frequency[term_id] -= 1
+        self._removed.add(doc_id)
+    
+    def postings(self, term: str) -> Tuple[np.ndarray, np.ndarray]:
+        term_id = self.vocabulary.get(term)
+        if term_id is None:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.int32)
+        
+        docs, freqs = [], []
+        if term_id < len(self._postings_indptr) - 1:
+            start, end = self._postings_indptr[term_id], self._postings_indptr[term_id + 1]
+            docs.append(np.asarray(self._postings_docs[start:end]))
+            freqs.append(np.asarray(self._postings_freqs[start:end]))
+        if term_id in self._new_postings:
+            new_docs, new_freqs = self._new_postings[term_id]
+            docs.append(np.asarray(new_docs, dtype=np.int32))
+            freqs.append(np.asarray(new_freqs, dtype=np.int32))
+        
+        docs = np.concatenate(docs) if docs else np.empty(0, dtype=np.int32)
+        freqs = np.concatenate(freqs) if freqs else np.empty(0, dtype=np.int32)
+        if self._removed:
+            alive = ~np.isin(docs, np.fromiter(self._removed, dtype=np.int32, count=len(self._removed)))
+            docs, freqs = docs[alive], freqs[alive]
+        return docs, freqs
+    
+    def documents(self, term: str) -> np.ndarray:
+        return self.postings(term)[0]
+    
+    def document_frequency(self, term: str) -> int:
+        term_id = self.vocabulary.get(term)
+        return 0 if term_id is None else self._document_frequency[term_id]
+    
+    def idf(self, term: str) -> float:
+        # Wygładzone IDF: nieznane słowo dostaje maksymalną wagę zamiast dzielenia przez zero
+        return math.log((1 + self.n_documents) / (1 + self.document_frequency(term))) + 1
+    
+    def most_common_terms(self, top_n: int = 10) -> List[Tuple[str, int]]:
+        frequencies = np.frombuffer(self._document_frequency, dtype=np.int64)
+        order = np.argsort(-frequencies, kind='stable')[:top_n]
+        return [(self.terms[term_id], int(frequencies[term_id])) for term_id in order if frequencies[term_id] > 0]
+    
+    def search(self, query: Union[str, List[str]], mode: str = 'all') -> np.ndarray:
+        if mode not in ('all', 'any'):
+            raise ValueError(f"Nieobsługiwany tryb wyszukiwania: {mode}")
+        
+        result = None
+        for term in set(self._tokens(query)):
+            docs = self.documents(term)
+            if result is None:
+                result = docs
+            elif mode == 'all':
+                result = np.intersect1d(result, docs, assume_unique=True)
+            else:
+                result = np.union1d(result, docs)
+        return np.sort(result) if result is not None else np.empty(0, dtype=np.int32)
+    
+    def similar(self, text: Union[str, List[str]], top_n: int = 10,
+                method: str = 'jaccard') -> List[Tuple[int, float]]:
+        if method not in ('jaccard', 'cosine'):
+            raise ValueError(f"Nieobsługiwana metoda podobieństwa: {method}")
+        
+        query = set(self._tokens(text))
+        if not query:
+            return []
+        
+        # Kandydaci to tylko dokumenty dzielące co najmniej jedno słowo z zapytaniem
+        overlap = np.zeros(len(self._document_lengths), dtype=np.int64)
+        for term in query:
+            np.add.at(overlap, self.documents(term), 1)
+        candidates = np.flatnonzero(overlap)
+        if len(candidates) == 0:
+            return []
+        
+        shared = overlap[candidates]
+        lengths = np.asarray(self._document_lengths, dtype=np.int64)[candidates]
+        if method == 'jaccard':
+            scores = shared / (len(query) + lengths - shared)
+        else:
+            scores = shared / np.sqrt(len(query) * lengths)
+        
+        order = np.lexsort((candidates, -scores))[:top_n]
+        return [(int(candidates[i]), float(scores[i])) for i in order]
+    
+    def compact(self) -> 'CorpusIndex':
+        # Scalenie przyrostu z częścią zamrożoną i fizyczne usunięcie postingów usuniętych dokumentów;
+        # identyfikatory dokumentów się nie zmieniają
+        removed = np.fromiter(self._removed, dtype=np.int32, count=len(self._removed))
+        
+        term_ids = [np.repeat(np.arange(len(self._postings_indptr) - 1, dtype=np.int32), np.diff(self._postings_indptr))]
+        docs = [np.asarray(self._postings_docs)]
+        freqs = [np.asarray(self._postings_freqs)]
+        for term_id, (new_docs, new_freqs) in self._new_postings.items():
+            term_ids.append(np.full(len(new_docs), term_id, dtype=np.int32))
+            docs.append(np.asarray(new_docs, dtype=np.int32))
+            freqs.append(np.asarray(new_freqs, dtype=np.int32))
+        term_ids, docs, freqs = np.concatenate(term_ids), np.concatenate(docs), np.concatenate(freqs)
+        
+        alive = ~np.isin(docs, removed)
+        term_ids, docs, freqs = term_ids[alive], docs[alive], freqs[alive]
+        order = np.lexsort((docs, term_ids))
+        self._postings_docs = docs[order]
+        self._postings_freqs = freqs[order]
+        self._postings_indptr = np.zeros(len(self.terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(term_ids, minlength=len(self.terms)), out=self._postings_indptr[1:])
+        
+        frozen = len(self._documents_indptr) - 1
+        owners = [np.repeat(np.arange(frozen, dtype=np.int32), np.diff(self._documents_indptr))]
+        entries = [np.asarray(self._documents_terms)]
+        for offset, row in enumerate(self._new_documents):
+            owners.append(np.full(len(row), frozen + offset, dtype=np.int32))
+            entries.append(np.asarray(row, dtype=np.int32))
+        owners, entries = np.concatenate(owners), np.concatenate(entries)
+        
+        alive = ~np.isin(owners, removed)
+        self._documents_terms = entries[alive]
+        self._documents_indptr = np.zeros(len(self._document_lengths) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners[alive], minlength=len(self._document_lengths)), out=self._documents_indptr[1:])
+        
+        self._new_postings = {}
+        self._new_documents = []
+        return self
+    
+    def save(self, path: str) -> None:
+        self.compact()
+        os.makedirs(path, exist_ok=True)
+        for name in self._ARRAYS:
+            np.save(os.path.join(path, f'{name}.npy'), getattr(self, f'_{name}'))
+        with open(os.path.join(path, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+            json.dump({'terms': self.terms, 'removed': sorted(self._removed)}, f, ensure_ascii=False)
+    
+    @classmethod
+    def load(cls, path: str, mmap: bool = True,
+             tokenizer: Optional[Callable[[str], List[str]]] = None) -> 'CorpusIndex':
+        index = cls(tokenizer)
+        for name in cls._ARRAYS:
+            setattr(index, f'_{name}', np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r' if mmap else None))
+        with open(os.path.join(path, 'vocabulary.json'), encoding='utf-8') as f:
+            meta = json.load(f)
+        
+        index.terms = meta['terms']
+        index.vocabulary = {term: term_id for term_id, term in enumerate(index.terms)}
+        index._removed = set(meta['removed'])
+        # Po compact() liczba postingów słowa to dokładnie jego częstość dokumentowa
+        index._document_frequency = array('q', np.diff(index._postings_indptr).tolist())
+        index._document_lengths = array('i', np.diff(index._documents_indptr).tolist())
+        return index
@@ -10,8 +10,12 @@ if str(project_root) not in sys.path:
 import pandas as pd
 import numpy as np
 import tempfile
+from unittest import mock
 
-from data_science_toolkit.data_utils import DataProcessor, load_csv_safe, normalize_data
+from data_science_toolkit.data_utils import (
+    DataProcessor, HashDeduplicator, CsvCache, HAS_PYARROW, load_csv_safe, load_csv_many, normalize_data,
+    sniff_csv_format, clear_format_cache, optimize_dtypes, Normalizer, RobustNormalizer, get_normalizer
+)
 
 
 class TestDataProcessor(unittest.TestCase):
@@ -36,6 +40,18 @@ class TestDataProcessor(unittest.TestCase):
         self.assertIsInstance(result, pd.DataFrame)
         self.assertEqual(result.shape, (3, 2))
     
+    def test_load_and_validate_copy_default(self):
+        result = self.processor.load_and_validate(self.sample_data)
+        self.assertFalse(np.shares_memory(result['A'].to_numpy(), self.sample_data['A'].to_numpy()))
+    
+    def test_load_and_validate_without_copy(self):
+        result = self.processor.load_and_validate(self.sample_data, copy=False)
+        self.assertTrue(np.shares_memory(result['A'].to_numpy(), self.sample_data['A'].to_numpy()))
+        
+        column = np.array([1.0, 2.0, 3.0])
+        result = self.processor.load_and_validate({'col': column}, copy=False)
+        self.assertTrue(np.shares_memory(result['col'].to_numpy(), column))
+    
     def test_load_and_validate_invalid_type(self):
         with self.assertRaises(ValueError) as context:
             self.processor.load_and_validate([1, 2, 3])
@@ -49,6 +65,106 @@ class TestDataProcessor(unittest.TestCase):
         unique_data = pd.DataFrame({'A': [1, 2, 3], 'B': [4, 5, 6]})
         result = self.processor.remove_duplicates(unique_data)
         self.assertEqual(len(result), 3)
+    
+    def test_load_and_validate_chunked_dataframe(self):
+        chunks = list(self.processor.load_and_validate(self.sample_data, chunksize=2))
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 2, 1])
+        self.assertEqual(self.processor.original_shape, (5, 3))
+    
+    def test_load_and_validate_chunked_csv(self):
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
+            self.sample_data.to_csv(f, index=False)
+        try:
+            chunks = self.processor.load_and_validate(f.name, chunksize=2)
+            self.assertIsNone(self.processor.original_shape)
+            result = pd.concat(chunks, ignore_index=True)
+            pd.testing.assert_frame_equal(result, self.sample_data)
+            self.assertEqual(self.processor.original_shape, (5, 3))
+        finally:
+            os.unlink(f.name)
+    
+    def test_load_and_validate_chunked_invalid_chunksize(self):
+        with self.assertRaises(ValueError):
+            self.processor.load_and_validate(self.sample_data, chunksize=0)
+    
+    def test_remove_duplicates_across_chunks(self):
+        chunks = self.processor.load_and_validate(self.sample_data, chunksize=2)
+        result = pd.concat(
+            [self.processor.remove_duplicates(chunk, across_chunks=True) for chunk in chunks]
+        )
+        pd.testing.assert_frame_equal(result, self.sample_data.drop_duplicates())
+    
+    def test_remove_duplicates_across_chunks_subset(self):
+        chunks = self.processor.load_and_validate(self.sample_data, chunksize=1)
+        result = pd.concat(
+            [self.processor.remove_duplicates(chunk, subset=['C'], across_chunks=True) for chunk in chunks]
+        )
+        self.assertEqual(list(result['C']), ['x', 'y', 'z'])
+
+
+class TestHashDeduplicator(unittest.TestCase):
+    
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.df = pd.DataFrame({
+            'id': rng.integers(0, 500, size=2000),
+            'val': rng.integers(0, 3, size=2000)
+        })
+    
+    def _filter_in_chunks(self, deduplicator, chunksize=128):
+        parts = [deduplicator.filter(self.df.iloc[i:i + chunksize]) for i in range(0, len(self.df), chunksize)]
+        return pd.concat(parts)
+    
+    def test_dtype_change_between_chunks(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'dane.csv')
+            with open(path, 'w') as f:
+                f.write('a,b\n1,x\n2,y\n1,x\n3,z\n4,z\n5,z\n,w\n1,x\n')
+            processor = DataProcessor()
+            parts = [processor.remove_duplicates(chunk, across_chunks=True)
+                     for chunk in processor.load_and_validate(path, chunksize=3)]
+            expected = pd.read_csv(path).drop_duplicates()
+        self.assertEqual(sum(len(part) for part in parts), len(expected))
+    
+    def test_matches_drop_duplicates(self):
+        deduplicator = HashDeduplicator(subset=['id'])
+        result = self._filter_in_chunks(deduplicator)
+        pd.testing.assert_frame_equal(result, self.df.drop_duplicates(subset=['id']))
+        self.assertEqual(deduplicator.seen_count, self.df['id'].nunique())
+    
+    def test_spill_to_disk(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            deduplicator = HashDeduplicator(n_partitions=8, max_memory_hashes=100, spill_dir=spill_dir)
+            result = self._filter_in_chunks(deduplicator)
+            self.assertTrue(deduplicator.spilled)
+            self.assertTrue(os.listdir(spill_dir))
+            pd.testing.assert_frame_equal(result, self.df.drop_duplicates())
+            deduplicator.close()
+            self.assertEqual(os.listdir(spill_dir), [])
+    
+    def test_runs_stay_logarithmic(self):
+        with tempfile.TemporaryDirectory() as spill_dir:
+            deduplicator = HashDeduplicator(n_partitions=1, max_memory_hashes=50, spill_dir=spill_dir)
+            df = pd.DataFrame({'id': np.arange(3000)})
+            for start in range(0, len(df), 10):
+                deduplicator.filter(df.iloc[start:start + 10])
+            runs = deduplicator._runs[0]
+            self.assertLessEqual(len(runs), int(np.log2(len(df))) + 1)
+            self.assertEqual(sum(len(run) for run, _ in runs), len(df))
+            self.assertEqual(len(os.listdir(deduplicator._spill_path)), len(runs))
+            self.assertEqual(len(deduplicator.filter(df.iloc[:100])), 0)
+            deduplicator.close()
+    
+    def test_invalid_partition_count(self):
+        with self.assertRaises(ValueError):
+            HashDeduplicator(n_partitions=3)
+    
+    def test_processor_logs_removed_count(self):
+        processor = DataProcessor(max_memory_hashes=10)
+        with self.assertLogs('data_science_toolkit.data_utils', level='INFO') as logs:
+            for chunk in processor.load_and_validate(self.df, chunksize=500):
+                processor.remove_duplicates(chunk, across_chunks=True)
+        self.assertTrue(any('duplikatów' in message for message in logs.output))
 
 
 class TestLoadCsvSafe(unittest.TestCase):
@@ -70,6 +186,254 @@ class TestLoadCsvSafe(unittest.TestCase):
     def test_load_csv_nonexistent_file(self):
         with self.assertRaises(FileNotFoundError):
             load_csv_safe('nieistniejacy_plik.csv')
+    
+    def test_load_csv_semicolon_decimal_comma(self):
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write('miasto;cena\nKraków;1,5\nŁódź;2,25\n')
+        df = load_csv_safe(self.temp_file.name)
+        self.assertEqual(list(df.columns), ['miasto', 'cena'])
+        self.assertAlmostEqual(df['cena'].sum(), 3.75)
+    
+    def test_load_csv_latin1_without_retry(self):
+        with open(self.temp_file.name, 'wb') as f:
+            f.write('A,B\n1,caf\xe9\n'.encode('latin-1'))
+        with mock.patch('data_science_toolkit.data_utils.pd.read_csv', wraps=pd.read_csv) as read_csv:
+            df = load_csv_safe(self.temp_file.name)
+        self.assertEqual(read_csv.call_count, 1)
+        self.assertEqual(df['B'].iloc[0], 'caf\xe9')
+    
+    def test_load_gzip_utf8_not_sniffed(self):
+        import gzip
+        path = self.temp_file.name + '.gz'
+        with gzip.open(path, 'wt', encoding='utf-8') as f:
+            f.write('miasto,cena\nKraków,1\nŁódź,2\n')
+        try:
+            df = load_csv_safe(path)
+        finally:
+            os.unlink(path)
+        self.assertEqual(list(df['miasto']), ['Kraków', 'Łódź'])
+    
+    def test_load_buffer(self):
+        import io
+        df = load_csv_safe(io.StringIO('A,B\n1,2\n'))
+        self.assertEqual(df.shape, (1, 2))
+
+
+class TestSniffCsvFormat(unittest.TestCase):
+    
+    def setUp(self):
+        clear_format_cache()
+        self.temp_file = tempfile.NamedTemporaryFile(mode='wb', suffix='.csv', delete=False)
+        self.temp_file.write(b'\xef\xbb\xbfA\tB\n1\t2\n3\t4\n')
+        self.temp_file.close()
+    
+    def tearDown(self):
+        os.unlink(self.temp_file.name)
+    
+    def test_detects_bom_and_delimiter(self):
+        csv_format = sniff_csv_format(self.temp_file.name)
+        self.assertEqual(csv_format['encoding'], 'utf-8-sig')
+        self.assertEqual(csv_format['delimiter'], '\t')
+        self.assertEqual(csv_format['decimal'], '.')
+        self.assertTrue(csv_format['has_header'])
+    
+    def test_result_cached_until_file_changes(self):
+        from data_science_toolkit.data_utils import _sniff_csv_format_cached
+        sniff_csv_format(self.temp_file.name)
+        sniff_csv_format(self.temp_file.name)
+        self.assertEqual(_sniff_csv_format_cached.cache_info().hits, 1)
+        
+        with open(self.temp_file.name, 'w', encoding='utf-8') as f:
+            f.write('A;B;C\n1;2;3\n')
+        stat = os.stat(self.temp_file.name)
+        os.utime(self.temp_file.name, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(sniff_csv_format(self.temp_file.name)['delimiter'], ';')
+    
+    def test_clear_single_path_keeps_other_entries(self):
+        from data_science_toolkit.data_utils import _sniff_csv_format_cached
+        other = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
+        other.write('A,B\n1,2\n')
+        other.close()
+        try:
+            sniff_csv_format(self.temp_file.name)
+            sniff_csv_format(other.name)
+            clear_format_cache(other.name)
+            sniff_csv_format(self.temp_file.name)
+            sniff_csv_format(other.name)
+            info = _sniff_csv_format_cached.cache_info()
+        finally:
+            os.unlink(other.name)
+        self.assertEqual((info.hits, info.misses), (1, 3))
+    
+    def test_compressed_path_rejected(self):
+        path = self.temp_file.name + '.gz'
+        open(path, 'wb').close()
+        try:
+            with self.assertRaises(ValueError):
+                sniff_csv_format(path)
+        finally:
+            os.unlink(path)
+
+
+class TestLoadCsvMany(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.paths = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir.name, f'part_{i}.csv')
+            pd.DataFrame({'A': [i, i + 1], 'B': ['x', 'y']}).to_csv(path, index=False)
+            self.paths.append(path)
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def test_load_glob_pattern(self):
+        df = load_csv_many(os.path.join(self.temp_dir.name, 'part_*.csv'), max_workers=2)
+        self.assertEqual(df.shape, (6, 2))
+        self.assertEqual(list(df['A']), [0, 1, 1, 2, 2, 3])
+    
+    def test_load_list_sequential_with_source(self):
+        df = load_csv_many(self.paths, max_workers=1, source_column='source')
+        self.assertEqual(list(df['source'].unique()), self.paths)
+    
+    def test_latin1_file_detected_per_file(self):
+        path = os.path.join(self.temp_dir.name, 'part_latin.csv')
+        with open(path, 'wb') as f:
+            f.write('A,B\n9,\xe9\n'.encode('latin-1'))
+        df = load_csv_many(self.paths + [path], max_workers=1)
+        self.assertEqual(df['B'].iloc[-1], '\xe9')
+    
+    def test_schema_mismatch(self):
+        path = os.path.join(self.temp_dir.name, 'part_bad.csv')
+        pd.DataFrame({'A': [1], 'C': [2]}).to_csv(path, index=False)
+        with self.assertRaises(ValueError) as context:
+            load_csv_many(self.paths + [path], max_workers=1)
+        self.assertIn("Niezgodny schemat", str(context.exception))
+    
+    def test_no_matching_files(self):
+        with self.assertRaises(FileNotFoundError):
+            load_csv_many(os.path.join(self.temp_dir.name, 'brak_*.csv'))
+
+
+class TestCsvCache(unittest.TestCase):
+    
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.temp_dir.name, 'dane.csv')
+        pd.DataFrame({'A': [1, 2, 3], 'B': [0.5, 1.5, 2.5]}).to_csv(self.csv_path, index=False)
+        self.cache_dir = os.path.join(self.temp_dir.name, 'cache')
+    
+    def tearDown(self):
+        self.temp_dir.cleanup()
+    
+    def _check_roundtrip(self, storage_format):
+        cache = CsvCache(self.cache_dir, storage_format=storage_format)
+        first = load_csv_safe(self.csv_path, cache=cache)
+        second = load_csv_safe(self.csv_path, cache=cache)
+        pd.testing.assert_frame_equal(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(cache.stats['entries'], 1)
+    
+    def test_pickle_roundtrip(self):
+        self._check_roundtrip('pickle')
+    
+    @unittest.skipUnless(HAS_PYARROW, "wymaga pyarrow")
+    def test_feather_roundtrip(self):
+        self._check_roundtrip('feather')
+    
+    def test_read_kwargs_are_part_of_key(self):
+        cache = CsvCache(self.cache_dir)
+        load_csv_safe(self.csv_path, cache=cache)
+        df = load_csv_safe(self.csv_path, cache=cache, usecols=['A'])
+        self.assertEqual(list(df.columns), ['A'])
+        self.assertEqual(cache.misses, 2)
+    
+    def test_eviction_by_size_and_age(self):
+        cache = CsvCache(self.cache_dir, max_bytes=0)
+        load_csv_safe(self.csv_path, cache=cache)
+        self.assertEqual(cache.stats['entries'], 0)
+        
+        cache = CsvCache(self.cache_dir, max_age=3600)
+        load_csv_safe(self.csv_path, cache=cache)
+        self.assertEqual(cache.evict(), 0)
+        cache.max_age = -1
+        self.assertEqual(cache.evict(), 1)
+    
+    def test_processor_uses_cache(self):
+        cache = CsvCache(self.cache_dir)
+        processor = DataProcessor(cache=cache)
+        processor.load_and_validate(self.csv_path)
+        df = processor.load_and_validate(self.csv_path)
+        self.assertEqual(df.shape, (3, 2))
+        self.assertEqual(cache.hits, 1)
+
+
+class TestOptimizeDtypes(unittest.TestCase):
+    
+    def setUp(self):
+        self.df = pd.DataFrame({
+            'small_int': np.arange(100, dtype=np.int64),
+            'negative_int': np.arange(-50, 50, dtype=np.int64),
+            'half': np.linspace(0, 49.5, 100),
+            'precise': np.linspace(0, 1, 100) / 3,
+            'city': ['Kraków', 'Warszawa'] * 50,
+            'date': ['2024-01-%02d' % (i % 28 + 1) for i in range(100)],
+            'name': [f'osoba_{i}' for i in range(100)]
+        })
+    
+    def test_downcasts_and_converts(self):
+        result = optimize_dtypes(self.df)
+        self.assertEqual(result['small_int'].dtype, np.uint8)
+        self.assertEqual(result['negative_int'].dtype, np.int8)
+        self.assertEqual(result['half'].dtype, np.float32)
+        self.assertEqual(result['precise'].dtype, np.float64)
+        self.assertIsInstance(result['city'].dtype, pd.CategoricalDtype)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(result['date']))
+        self.assertNotIsInstance(result['name'].dtype, pd.CategoricalDtype)
+        pd.testing.assert_series_equal(result['small_int'].astype(np.int64), self.df['small_int'])
+    
+    def test_allow_precision_loss(self):
+        result = optimize_dtypes(self.df, allow_precision_loss=True)
+        self.assertEqual(result['precise'].dtype, np.float32)
+    
+    def test_processor_memory_report(self):
+        processor = DataProcessor()
+        result = processor.load_and_validate(self.df, optimize=True)
+        self.assertEqual(result.shape, self.df.shape)
+        self.assertLess(processor.memory_report['after_bytes'], processor.memory_report['before_bytes'])
+        self.assertEqual(self.df['small_int'].dtype, np.int64)
+    
+    def test_streaming_chunks_skip_categoricals(self):
+        processor = DataProcessor()
+        chunks = list(processor.load_and_validate(self.df, chunksize=30, optimize=True))
+        self.assertNotIsInstance(chunks[0]['city'].dtype, pd.CategoricalDtype)
+        self.assertEqual(chunks[0]['small_int'].dtype, np.uint8)
+    
+    def test_streaming_chunks_share_dtypes(self):
+        df = pd.DataFrame({
+            'value': [1, 2, 3, 40_000],
+            'ratio': [0.5, 1.5, np.nan, 2.5],
+            'date': ['2024-01-01', '2024-01-02', None, None]
+        })
+        processor = DataProcessor()
+        chunks = list(processor.load_and_validate(df, chunksize=2, optimize=True))
+        for column in df.columns:
+            self.assertEqual(chunks[0][column].dtype, chunks[1][column].dtype)
+        self.assertEqual(chunks[0]['value'].dtype, np.uint16)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(chunks[1]['date']))
+        self.assertLess(processor.memory_report['after_bytes'], processor.memory_report['before_bytes'])
+        
+        # Z CSV kolumna pusta w całej porcji ma typ float64 i nie może blokować parsowania dat
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'dane.csv')
+            with open(path, 'w') as f:
+                f.write('date,count\n2024-01-01,1\n2024-01-02,2\n,3\n,\n2024-01-05,5\n2024-01-06,6\n')
+            chunks = list(DataProcessor().load_and_validate(path, chunksize=2, optimize=True))
+        self.assertEqual(len({str(chunk['date'].dtype) for chunk in chunks}), 1)
+        self.assertEqual(len({str(chunk['count'].dtype) for chunk in chunks}), 1)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(chunks[1]['date']))
+        self.assertEqual(list(pd.concat(chunks)['count'].dropna()), [1, 2, 3, 5, 6])
 
 
 class TestNormalizeData(unittest.TestCase):
@@ -103,6 +467,113 @@ class TestNormalizeData(unittest.TestCase):
         result = normalize_data(constant_data, method='minmax')
         expected = np.zeros(5)
         np.testing.assert_array_equal(result, expected)
+    
+    def test_column_wise_dataframe(self):
+        df = pd.DataFrame({'a': [1.0, 2.0, 3.0], 'b': [10.0, 30.0, 20.0], 'c': [4.0, 4.0, 4.0]})
+        result = normalize_data(df, method='minmax', axis=0)
+        expected = np.array([[0.0, 0.0, 0.0], [0.5, 1.0, 0.0], [1.0, 0.5, 0.0]])
+        np.testing.assert_array_almost_equal(result, expected)
+    
+    def test_column_wise_matches_per_column(self):
+        matrix = np.random.default_rng(0).normal(size=(50, 4))
+        for method in ('minmax', 'zscore', 'robust'):
+            result = normalize_data(matrix, method=method, axis=0)
+            for col in range(matrix.shape[1]):
+                np.testing.assert_allclose(result[:, col], normalize_data(matrix[:, col], method=method))
+    
+    def test_out_and_float32(self):
+        matrix = np.random.default_rng(0).normal(size=(20, 3))
+        out = np.empty(matrix.shape, dtype=np.float32)
+        result = normalize_data(matrix, method='zscore', axis=0, out=out)
+        self.assertIs(result, out)
+        np.testing.assert_allclose(result, normalize_data(matrix, method='zscore', axis=0), rtol=1e-5)
+        self.assertEqual(normalize_data(matrix, axis=0, dtype=np.float32).dtype, np.float32)
+    
+    def test_out_in_place(self):
+        for method in ('minmax', 'zscore', 'robust'):
+            matrix = np.array([[1.0, 2.0], [3.0, 10.0], [5.0, 4.0], [7.0, 1.0]])
+            expected = normalize_data(matrix, method=method, axis=0)
+            result = normalize_data(matrix, method=method, axis=0, out=matrix)
+            self.assertIs(result, matrix)
+            np.testing.assert_allclose(result, expected)
+    
+    def test_out_shape_mismatch(self):
+        with self.assertRaises(ValueError):
+            normalize_data(np.ones((3, 2)), axis=0, out=np.empty((2, 3)))
+
+
+class TestNormalizers(unittest.TestCase):
+    
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.data = np.column_stack([rng.normal(5, 2, 1000), rng.exponential(3, 1000), np.full(1000, 7.0)])
+        self.batches = np.array_split(self.data, 7)
+    
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            Normalizer()
+    
+    def test_partial_fit_matches_normalize_data(self):
+        for method, kwargs in (('minmax', {}), ('zscore', {}), ('robust', {'k': 2048})):
+            normalizer = get_normalizer(method, **kwargs)
+            for batch in self.batches:
+                normalizer.partial_fit(batch)
+            result = normalizer.transform(self.data)
+            for col in range(2):
+                np.testing.assert_allclose(result[:, col], normalize_data(self.data[:, col], method=method))
+            np.testing.assert_array_equal(result[:, 2], np.zeros(1000))
+    
+    def test_inverse_transform(self):
+        normalizer = get_normalizer('zscore').fit(self.data[:, :2])
+        restored = normalizer.inverse_transform(normalizer.transform(self.data[:, :2]))
+        np.testing.assert_allclose(restored, self.data[:, :2])
+    
+    def test_robust_sketch_approximation(self):
+        data = np.random.default_rng(2).lognormal(size=200_000)
+        normalizer = RobustNormalizer(k=200, random_state=0)
+        for batch in np.array_split(data, 20):
+            normalizer.partial_fit(batch)
+        
+        sketch = normalizer.sketches_[0]
+        self.assertLess(len(sketch.to_arrays()['items']), 1000)
+        rank = np.mean(data <= normalizer.center_)
+        self.assertLess(abs(rank - 0.5), sketch.rank_error)
+        mad = np.median(np.abs(data - np.median(data)))
+        self.assertAlmostEqual(normalizer.scale_, mad, delta=0.05 * mad)
+    
+    def test_merge_matches_single_pass(self):
+        for method in ('minmax', 'zscore'):
+            left = get_normalizer(method).fit(self.data[:400])
+            right = get_normalizer(method).fit(self.data[400:])
+            full = get_normalizer(method).fit(self.data)
+            left.merge(right)
+            np.testing.assert_allclose(left.center_, full.center_)
+            np.testing.assert_allclose(left.scale_, full.scale_)
+        
+        left = RobustNormalizer(k=2048).fit(self.data[:400])
+        left.merge(RobustNormalizer(k=2048).fit(self.data[400:]))
+        np.testing.assert_allclose(left.center_, np.median(self.data, axis=0))
+    
+    def test_merge_type_mismatch(self):
+        with self.assertRaises(ValueError):
+            get_normalizer('minmax').fit(self.data).merge(get_normalizer('zscore').fit(self.data))
+    
+    def test_save_and_load(self):
+        for normalizer in (get_normalizer('minmax').fit(self.data), RobustNormalizer(k=16).fit(self.data)):
+            with tempfile.TemporaryDirectory() as temp_dir:
+                path = os.path.join(temp_dir, 'normalizer.npz')
+                normalizer.save(path)
+                loaded = Normalizer.load(path)
+            self.assertIsInstance(loaded, type(normalizer))
+            np.testing.assert_array_equal(loaded.transform(self.data), normalizer.transform(self.data))
+    
+    def test_transform_before_fit(self):
+        with self.assertRaises(ValueError):
+            get_normalizer('zscore').transform([1, 2, 3])
+    
+    def test_invalid_method(self):
+        with self.assertRaises(ValueError):
+            get_normalizer('nieprawidlowa')
 
 
 if __name__ == '__main__':
@@ -1,5 +1,8 @@
 import unittest
 import sys
+import os
+import math
+import tempfile
 from pathlib import Path
 
 project_root = Path(__file__).parent.parent
@@ -8,9 +11,11 @@ if str(project_root) not in sys.path:
 
 import numpy as np
 import pandas as pd
+from scipy import stats as scipy_stats
 
 from data_science_toolkit.math_tools import (
-    StatisticalCalculator, advanced_mean, correlation_matrix, moving_average
+    StatisticalCalculator, StreamingStats, QuantileSketch, CalculationHistory, advanced_mean, correlation_matrix, moving_average,
+    RollingMean, RollingEMA, RollingWeightedMean, RollingMedian, CorrelationAccumulator
 )
 
 
@@ -31,6 +36,29 @@ class TestStatisticalCalculator(unittest.TestCase):
         self.assertIn('std', stats)
         self.assertIn('var', stats)
     
+    def test_descriptive_stats_matches_reference(self):
+        data = np.random.default_rng(0).lognormal(size=200_001)
+        result = self.calc.descriptive_stats(data)
+        reference = {
+            'mean': np.mean(data), 'median': np.median(data),
+            'std': np.std(data, ddof=1), 'var': np.var(data, ddof=1),
+            'min': np.min(data), 'max': np.max(data),
+            'q25': np.percentile(data, 25), 'q75': np.percentile(data, 75),
+            'skewness': scipy_stats.skew(data), 'kurtosis': scipy_stats.kurtosis(data)
+        }
+        self.assertEqual(result['count'], len(data))
+        for key, expected in reference.items():
+            self.assertAlmostEqual(result[key], expected, delta=1e-9 * abs(expected), msg=key)
+    
+    def test_descriptive_stats_constant_and_nan(self):
+        constant = self.calc.descriptive_stats([3.0] * 7)
+        self.assertEqual(constant['var'], 0.0)
+        self.assertTrue(np.isnan(constant['skewness']))
+        
+        with_nan = self.calc.descriptive_stats([1.0, np.nan, 3.0])
+        self.assertTrue(np.isnan(with_nan['mean']))
+        self.assertTrue(np.isnan(with_nan['median']))
+    
     def test_descriptive_stats_empty_data(self):
         with self.assertRaises(ValueError) as context:
             self.calc.descriptive_stats([])
@@ -46,6 +74,196 @@ class TestStatisticalCalculator(unittest.TestCase):
         with self.assertRaises(ValueError) as context:
             self.calc.confidence_interval([1])
         self.assertIn("co najmniej 2 punktów danych", str(context.exception))
+    
+    def test_bootstrap_confidence_interval_matches_scipy(self):
+        data = np.random.default_rng(6).lognormal(size=200)
+        for method, scipy_method in (('percentile', 'percentile'), ('bca', 'BCa')):
+            lower, upper = self.calc.confidence_interval(data, method=method, random_state=0)
+            reference = scipy_stats.bootstrap(
+                (data,), np.mean, method=scipy_method, n_resamples=9999, random_state=0
+            ).confidence_interval
+            self.assertAlmostEqual(lower, reference.low, delta=0.02)
+            self.assertAlmostEqual(upper, reference.high, delta=0.02)
+    
+    def test_bootstrap_reproducible_across_chunks_and_jobs(self):
+        data = np.random.default_rng(7).exponential(size=100)
+        serial = self.calc.confidence_interval(data, method='bca', statistic=np.median,
+                                               n_resamples=2000, random_state=3, chunk_size=300)
+        parallel = self.calc.confidence_interval(data, method='bca', statistic=np.median,
+                                                 n_resamples=2000, random_state=3, chunk_size=300, n_jobs=2)
+        self.assertEqual(serial, parallel)
+        self.assertLess(serial[0], np.median(data))
+        self.assertGreater(serial[1], np.median(data))
+    
+    def test_bootstrap_unpicklable_statistic_runs_serially(self):
+        data = np.random.default_rng(8).normal(size=50)
+        statistic = lambda sample, axis=None: np.mean(sample, axis=axis)
+        with self.assertWarns(RuntimeWarning):
+            parallel = self.calc.confidence_interval(data, method='percentile', statistic=statistic,
+                                                     n_resamples=500, random_state=1, chunk_size=100, n_jobs=2)
+        serial = self.calc.confidence_interval(data, method='percentile', statistic=statistic,
+                                               n_resamples=500, random_state=1, chunk_size=100)
+        self.assertEqual(parallel, serial)
+    
+    def test_bca_degenerate_returns_nan(self):
+        with self.assertWarns(RuntimeWarning):
+            lower, upper = self.calc.confidence_interval([2.0] * 20, method='bca', n_resamples=200, random_state=0)
+        self.assertTrue(np.isnan(lower) and np.isnan(upper))
+    
+    def test_confidence_interval_invalid_method(self):
+        with self.assertRaises(ValueError) as context:
+            self.calc.confidence_interval(self.sample_data, method='nieprawidlowa')
+        self.assertIn("Nieobsługiwana metoda przedziału ufności", str(context.exception))
+    
+    def test_confidence_interval_batch(self):
+        matrix = np.random.default_rng(8).normal(size=(30, 4))
+        matrix[0, 1] = np.nan
+        result = self.calc.confidence_interval_batch(matrix)
+        self.assertEqual(list(result.columns), ['lower', 'upper'])
+        for col in range(4):
+            column = matrix[:, col]
+            expected = self.calc.confidence_interval(column[~np.isnan(column)])
+            np.testing.assert_allclose(result.loc[col].to_numpy(), expected)
+
+
+class TestGroupedStats(unittest.TestCase):
+    
+    def setUp(self):
+        self.calc = StatisticalCalculator()
+        rng = np.random.default_rng(4)
+        self.df = pd.DataFrame({
+            'sklep': rng.choice(['A', 'B', 'C', 'D'], size=400),
+            'sprzedaz': rng.gamma(2.0, 10.0, size=400)
+        })
+        self.df.loc[:2, 'sklep'] = 'E'
+    
+    def _assert_matches_loop(self, result, groups):
+        for key, values in groups:
+            expected = self.calc.descriptive_stats(values)
+            for stat, value in expected.items():
+                self.assertAlmostEqual(result.loc[key, stat], value, delta=1e-9 * max(1.0, abs(value)), msg=stat)
+    
+    def test_dataframe_groups(self):
+        result = self.calc.grouped_stats(self.df, by='sklep')
+        self.assertEqual(list(result.index), ['A', 'B', 'C', 'D', 'E'])
+        groups = [(key, group['sprzedaz'].to_numpy()) for key, group in self.df.groupby('sklep')]
+        self._assert_matches_loop(result, groups)
+    
+    def test_matrix_columns(self):
+        matrix = np.random.default_rng(5).normal(size=(50, 6))
+        result = self.calc.grouped_stats(matrix)
+        self.assertEqual(result.shape, (6, 11))
+        self._assert_matches_loop(result, [(i, matrix[:, i]) for i in range(6)])
+    
+    def test_process_pool_matches_serial(self):
+        serial = self.calc.grouped_stats(self.df, by='sklep', column='sprzedaz')
+        parallel = self.calc.grouped_stats(self.df, by='sklep', column='sprzedaz', n_jobs=2)
+        pd.testing.assert_frame_equal(serial, parallel)
+    
+    def test_nan_group(self):
+        df = pd.DataFrame({'g': [1, 1, 2, 2], 'v': [1.0, np.nan, 2.0, 4.0]})
+        result = self.calc.grouped_stats(df, by='g')
+        self.assertTrue(np.isnan(result.loc[1, 'mean']))
+        self.assertTrue(np.isnan(result.loc[1, 'min']))
+        self.assertEqual(result.loc[2, 'mean'], 3.0)
+    
+    def test_ambiguous_value_column(self):
+        df = self.df.assign(inna=1.0)
+        with self.assertRaises(ValueError):
+            self.calc.grouped_stats(df, by='sklep')
+
+
+class TestCalculationHistory(unittest.TestCase):
+    
+    def test_default_history_keeps_entries(self):
+        calc = StatisticalCalculator()
+        result = calc.descriptive_stats([1, 2, 3])
+        self.assertEqual(len(calc.calculation_history), 1)
+        name, values = calc.calculation_history[0]
+        self.assertEqual(name, 'descriptive_stats')
+        self.assertEqual(values, result)
+    
+    def test_ring_buffer(self):
+        calc = StatisticalCalculator(history_size=3)
+        for i in range(10):
+            calc.descriptive_stats([1, 2, i])
+        self.assertEqual(len(calc.calculation_history), 3)
+        self.assertEqual([values['max'] for _, values in calc.calculation_history], [7, 8, 9])
+    
+    def test_disabled_history(self):
+        for calc in (StatisticalCalculator(track_history=False), StatisticalCalculator(history_size=0)):
+            calc.descriptive_stats([1, 2, 3])
+            self.assertEqual(len(calc.calculation_history), 0)
+            self.assertIsNotNone(calc.last_calculation)
+    
+    def test_export_and_drain(self):
+        history = CalculationHistory()
+        for i in range(4):
+            history.append(('descriptive_stats', {'count': 3, 'mean': float(i)}))
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, 'historia.csv')
+            self.assertEqual(history.export(path), 4)
+            self.assertEqual(history.export(path, drain=True), 4)
+            exported = pd.read_csv(path)
+        self.assertEqual(len(history), 0)
+        self.assertEqual(list(exported['mean']), [0.0, 1.0, 2.0, 3.0] * 2)
+        self.assertEqual(history.drain(), [])
+    
+    def test_list_compatibility(self):
+        calc = StatisticalCalculator(history_size=3)
+        for i in range(4):
+            calc.descriptive_stats([1, 2, i])
+        history = calc.calculation_history
+        entries = list(history)
+        self.assertEqual(history, entries)
+        self.assertEqual(history[1:], entries[1:])
+        self.assertEqual(history + [('x', {'a': 1.0})], entries + [('x', {'a': 1.0})])
+        
+        history += [('inne', {'a': 1.0})]
+        self.assertIs(calc.calculation_history, history)
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history[-1], ('inne', {'a': 1.0}))
+        del history[0]
+        self.assertEqual(history, entries[2:] + [('inne', {'a': 1.0})])
+
+
+class TestStreamingStats(unittest.TestCase):
+    
+    def setUp(self):
+        self.data = np.random.default_rng(3).gamma(2.0, size=50_000)
+        self.exact = StatisticalCalculator().descriptive_stats(self.data)
+    
+    def _assert_close_to_exact(self, result):
+        for key in ('count', 'mean', 'std', 'var', 'min', 'max', 'skewness', 'kurtosis'):
+            self.assertAlmostEqual(result[key], self.exact[key], delta=1e-9 * abs(self.exact[key]), msg=key)
+        for key, q in (('q25', 0.25), ('median', 0.5), ('q75', 0.75)):
+            rank = np.mean(self.data <= result[key])
+            self.assertLess(abs(rank - q), 0.0165, msg=key)
+    
+    def test_update_in_batches(self):
+        accumulator = StreamingStats(random_state=0)
+        for batch in np.array_split(self.data, 17):
+            accumulator.update(batch)
+        self._assert_close_to_exact(accumulator.result())
+    
+    def test_merge_shards(self):
+        shards = [StreamingStats(random_state=i).update(part) for i, part in enumerate(np.array_split(self.data, 5))]
+        merged = StreamingStats()
+        for shard in shards:
+            merged.merge(shard)
+        self._assert_close_to_exact(merged.result())
+    
+    def test_confidence_interval_matches_calculator(self):
+        calc = StatisticalCalculator()
+        accumulator = StreamingStats().update(self.data[:100]).update(self.data[100:1000])
+        np.testing.assert_allclose(calc.confidence_interval(accumulator), calc.confidence_interval(self.data[:1000]))
+        self.assertEqual(calc.descriptive_stats(accumulator)['count'], 1000)
+    
+    def test_empty_accumulator(self):
+        with self.assertRaises(ValueError):
+            StreamingStats().result()
+        with self.assertRaises(ValueError):
+            StreamingStats().update([1.0]).confidence_interval()
 
 
 class TestAdvancedMean(unittest.TestCase):
@@ -80,6 +298,36 @@ class TestAdvancedMean(unittest.TestCase):
             advanced_mean(self.positive_data, method='nieprawidlowa')
         self.assertIn("Nieobsługiwana metoda średniej", str(context.exception))
     
+    def test_axis_matches_per_column(self):
+        matrix = np.random.default_rng(13).uniform(0.5, 5.0, size=(50, 4))
+        for method, reference in (('arithmetic', np.mean), ('geometric', scipy_stats.gmean),
+                                  ('harmonic', scipy_stats.hmean)):
+            expected = [reference(matrix[:, col]) for col in range(4)]
+            np.testing.assert_allclose(advanced_mean(matrix, method=method, axis=0), expected)
+        np.testing.assert_allclose(advanced_mean(matrix, method='quadratic', axis=1),
+                                   np.sqrt(np.mean(matrix ** 2, axis=1)))
+    
+    def test_weighted(self):
+        matrix = np.random.default_rng(14).uniform(0.5, 5.0, size=(30, 3))
+        weights = np.random.default_rng(15).uniform(0.1, 2.0, size=30)
+        np.testing.assert_allclose(advanced_mean(matrix, axis=0, weights=weights),
+                                   np.average(matrix, axis=0, weights=weights))
+        np.testing.assert_allclose(advanced_mean(matrix, method='geometric', axis=0, weights=weights),
+                                   scipy_stats.gmean(matrix, axis=0, weights=weights[:, None]))
+        with self.assertRaises(ValueError):
+            advanced_mean(matrix, axis=0, weights=weights[:10])
+    
+    def test_geometric_does_not_overflow(self):
+        result = advanced_mean(np.full(1000, 1e300), method='geometric')
+        self.assertAlmostEqual(result / 1e300, 1.0)
+    
+    def test_nan_policy(self):
+        matrix = np.array([[1.0, 4.0], [np.nan, 16.0], [4.0, np.nan]])
+        self.assertTrue(np.isnan(advanced_mean(matrix, axis=0)).all())
+        np.testing.assert_allclose(advanced_mean(matrix, method='geometric', axis=0, nan_policy='omit'), [2.0, 8.0])
+        with self.assertRaises(ValueError):
+            advanced_mean(matrix, nan_policy='raise')
+    
     def test_empty_data(self):
         with self.assertRaises(ValueError) as context:
             advanced_mean([], method='arithmetic')
@@ -107,12 +355,138 @@ class TestCorrelationMatrix(unittest.TestCase):
             correlation_matrix(self.df, method='nieprawidlowa')
         self.assertIn("Nieobsługiwana metoda korelacji", str(context.exception))
     
+    def test_matches_pandas(self):
+        rng = np.random.default_rng(16)
+        df = pd.DataFrame(rng.integers(0, 4, size=(40, 5)).astype(float), columns=list('abcde'))
+        df['f'] = rng.normal(size=40)
+        df['g'] = 1.0
+        for method in ('pearson', 'spearman', 'kendall'):
+            pd.testing.assert_frame_equal(correlation_matrix(df, method=method, block_size=3),
+                                          df.corr(method=method), atol=1e-12)
+    
+    def test_kendall_blocks_in_parallel(self):
+        df = pd.DataFrame(np.random.default_rng(17).normal(size=(100, 12)))
+        result = correlation_matrix(df, method='kendall', block_size=4, n_jobs=2)
+        pd.testing.assert_frame_equal(result, df.corr(method='kendall'), atol=1e-12)
+    
+    def test_float32(self):
+        df = pd.DataFrame(np.random.default_rng(18).normal(size=(200, 6))) + 1000
+        result = correlation_matrix(df, dtype='float32')
+        self.assertTrue((result.dtypes == np.float32).all())
+        np.testing.assert_allclose(result.to_numpy(), df.corr().to_numpy(), atol=1e-6)
+        with self.assertRaises(ValueError):
+            correlation_matrix(df, dtype='int64')
+    
+    def test_missing_values_use_pairwise_pandas(self):
+        df = pd.DataFrame(np.random.default_rng(19).normal(size=(30, 3)))
+        df.iloc[2, 1] = np.nan
+        for method in ('pearson', 'kendall'):
+            pd.testing.assert_frame_equal(correlation_matrix(df, method=method), df.corr(method=method))
+    
+    def _wide_frame(self):
+        values = np.random.default_rng(21).normal(size=(80, 15))
+        values[:, 1] += values[:, 0]
+        values[:, 4] = 3.0
+        return pd.DataFrame(values, columns=[f'k{i}' for i in range(15)])
+    
+    def test_threshold_edges(self):
+        df = self._wide_frame()
+        for method in ('pearson', 'spearman', 'kendall'):
+            dense = correlation_matrix(df, method=method)
+            upper = dense.where(np.triu(np.ones(dense.shape, dtype=bool), 1)).stack()
+            expected = upper[upper.abs() >= 0.1]
+            edges = correlation_matrix(df, method=method, threshold=0.1, block_size=4)
+            self.assertEqual(list(edges.columns), ['source', 'target', 'correlation'])
+            self.assertEqual(len(edges), len(expected))
+            for row in edges.itertuples():
+                self.assertAlmostEqual(row.correlation, dense.loc[row.source, row.target])
+    
+    def test_top_k_partners(self):
+        df = self._wide_frame()
+        dense = correlation_matrix(df)
+        edges = correlation_matrix(df, top_k=3, block_size=4)
+        for column in dense.columns.drop('k4'):
+            expected = dense[column].drop(column).dropna().abs().sort_values(ascending=False)
+            partners = edges[edges['source'] == column]
+            np.testing.assert_allclose(partners['correlation'].abs(), expected.iloc[:3])
+        self.assertNotIn('k4', set(edges['source']) | set(edges['target']))
+    
+    def test_coo_output(self):
+        df = self._wide_frame()
+        coo = correlation_matrix(df, method='kendall', top_k=2, output='coo', n_jobs=2, block_size=5)
+        self.assertEqual(coo.shape, (15, 15))
+        self.assertEqual(coo.nnz, 14 * 2)
+        dense = correlation_matrix(df, method='kendall')
+        np.testing.assert_allclose(coo.data, dense.to_numpy()[coo.row, coo.col])
+    
+    def test_sparse_mode_validation(self):
+        df = self._wide_frame()
+        with self.assertRaises(ValueError):
+            correlation_matrix(df, output='edges')
+        with self.assertRaises(ValueError):
+            correlation_matrix(df, top_k=2, output='dense')
+        df.iloc[0, 0] = np.nan
+        with self.assertRaises(ValueError):
+            correlation_matrix(df, threshold=0.5)
+    
     def test_non_dataframe_input(self):
         with self.assertRaises(ValueError) as context:
             correlation_matrix([1, 2, 3])
         self.assertIn("pandas DataFrame", str(context.exception))
 
 
+class TestCorrelationAccumulator(unittest.TestCase):
+    
+    def setUp(self):
+        rng = np.random.default_rng(20)
+        values = rng.normal(size=(5000, 4))
+        values[:, 1] += values[:, 0]
+        values[:, 2] = np.exp(values[:, 0]) + rng.normal(size=5000) * 0.5
+        self.df = pd.DataFrame(values, columns=list('abcd'))
+        self.df['stała'] = 2.0
+        self.df['tekst'] = 'x'
+    
+    def _chunks(self, n_chunks):
+        bounds = np.linspace(0, len(self.df), n_chunks + 1).astype(int)
+        return [self.df.iloc[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+    
+    def test_update_matches_pearson(self):
+        accumulator = CorrelationAccumulator()
+        for chunk in self._chunks(7):
+            accumulator.update(chunk)
+        self.assertEqual(accumulator.count, len(self.df))
+        pd.testing.assert_frame_equal(accumulator.result(), self.df.corr(numeric_only=True), atol=1e-12)
+    
+    def test_merge_partial_results(self):
+        parts = [CorrelationAccumulator().update(chunk) for chunk in self._chunks(3)]
+        merged = CorrelationAccumulator()
+        for part in parts:
+            merged.merge(part)
+        pd.testing.assert_frame_equal(merged.result(), self.df.corr(numeric_only=True), atol=1e-12)
+    
+    def test_approximate_spearman(self):
+        accumulator = CorrelationAccumulator(method='spearman', random_state=0)
+        for chunk in self._chunks(20):
+            accumulator.update(chunk)
+        expected = self.df.corr(method='spearman', numeric_only=True)
+        np.testing.assert_allclose(accumulator.result().to_numpy(), expected.to_numpy(), atol=0.01)
+    
+    def test_rows_with_missing_values_are_skipped(self):
+        chunk = self.df.iloc[:100].copy()
+        chunk.iloc[5, 0] = np.nan
+        accumulator = CorrelationAccumulator().update(chunk)
+        self.assertEqual(accumulator.count, 99)
+    
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            CorrelationAccumulator(method='kendall')
+        accumulator = CorrelationAccumulator().update(self.df.iloc[:10])
+        with self.assertRaises(ValueError):
+            accumulator.update(self.df[['a', 'b']])
+        with self.assertRaises(ValueError):
+            CorrelationAccumulator().result()
+
+
 class TestMovingAverage(unittest.TestCase):
     
     def setUp(self):
@@ -128,6 +502,64 @@ class TestMovingAverage(unittest.TestCase):
         self.assertEqual(len(result), 10)
         self.assertEqual(result[0], 1.0)
     
+    def test_exponential_matches_recursion(self):
+        data = np.random.default_rng(9).normal(size=500)
+        alpha = 2.0 / 11
+        expected = np.zeros(500)
+        expected[0] = data[0]
+        for i in range(1, 500):
+            expected[i] = alpha * data[i] + (1 - alpha) * expected[i-1]
+        np.testing.assert_allclose(moving_average(data, window=10, method='exponential'), expected)
+    
+    def test_exponential_columns_and_float32(self):
+        matrix = np.random.default_rng(10).normal(size=(100, 3)).astype(np.float32)
+        result = moving_average(matrix, window=5, method='exponential')
+        self.assertEqual(result.shape, matrix.shape)
+        self.assertEqual(result.dtype, np.float32)
+        for col in range(3):
+            np.testing.assert_allclose(
+                result[:, col], moving_average(matrix[:, col].astype(np.float64), window=5, method='exponential'),
+                rtol=1e-5, atol=1e-5
+            )
+    
+    def test_exponential_skips_nan(self):
+        data = [np.nan, 1.0, 2.0, np.nan, 4.0]
+        result = moving_average(data, window=3, method='exponential')
+        expected_tail = moving_average([1.0, 2.0, 4.0], window=3, method='exponential')
+        self.assertTrue(np.isnan(result[0]))
+        np.testing.assert_allclose(result[[1, 2, 4]], expected_tail)
+        self.assertEqual(result[3], result[2])
+    
+    def test_simple_backends_agree(self):
+        data = np.random.default_rng(11).normal(size=5000).cumsum() + 1e6
+        for window in (5, 500):
+            expected = np.convolve(data, np.ones(window) / window, mode='valid')
+            for backend in ('auto', 'direct', 'cumsum', 'fft'):
+                np.testing.assert_allclose(
+                    moving_average(data, window, backend=backend), expected, rtol=1e-13
+                )
+    
+    def test_cumsum_backend_is_compensated(self):
+        # Duże przesunięcie i mała wariancja - zwykła różnica sum prefiksowych traci cyfry
+        data = np.random.default_rng(12).normal(size=100_000) * 1e-3 + 1e8
+        window = 1000
+        expected = np.array([math.fsum(data[i:i + window]) / window for i in range(0, 99_001, 4999)])
+        result = moving_average(data, window, backend='cumsum')[::4999]
+        # Błąd nie większy niż jedno ULP wyniku (zwykłe sumy prefiksowe: ~1000 ULP)
+        np.testing.assert_allclose(result, expected, rtol=0, atol=np.spacing(1e8))
+    
+    def test_auto_backend_with_nan(self):
+        data = np.arange(1000, dtype=float)
+        data[10] = np.nan
+        result = moving_average(data, 200)
+        self.assertTrue(np.isnan(result[:11]).all())
+        self.assertFalse(np.isnan(result[11:]).any())
+    
+    def test_invalid_backend(self):
+        with self.assertRaises(ValueError) as context:
+            moving_average(self.data, window=3, backend='gpu')
+        self.assertIn("Nieobsługiwany backend", str(context.exception))
+    
     def test_invalid_window_size(self):
         with self.assertRaises(ValueError) as context:
             moving_average(self.data, window=0)
@@ -139,5 +571,119 @@ class TestMovingAverage(unittest.TestCase):
         self.assertIn("Nieobsługiwana metoda średniej ruchomej", str(context.exception))
 
 
+class TestRollingWindows(unittest.TestCase):
+    
+    def setUp(self):
+        self.data = np.random.default_rng(3).normal(size=500)
+        self.window = 7
+    
+    def _feed(self, rolling):
+        # Losowy podział na porcje, w tym pojedyncze próbki
+        rng = np.random.default_rng(4)
+        outputs, start = [], 0
+        while start < len(self.data):
+            size = int(rng.integers(1, 25))
+            outputs.append(rolling.update(self.data[start:start + size]))
+            start += size
+        return np.concatenate(outputs)
+    
+    def test_rolling_mean_matches_simple(self):
+        rolling = RollingMean(self.window)
+        result = self._feed(rolling)
+        np.testing.assert_allclose(result, moving_average(self.data, self.window, 'simple'))
+        self.assertEqual(rolling.count, len(self.data))
+        self.assertAlmostEqual(rolling.value, self.data[-self.window:].mean())
+    
+    def test_rolling_ema_matches_exponential(self):
+        result = self._feed(RollingEMA(self.window))
+        np.testing.assert_allclose(result, moving_average(self.data, self.window, 'exponential'))
+    
+    def test_rolling_ema_skips_nan(self):
+        rolling = RollingEMA(alpha=0.5)
+        np.testing.assert_allclose(rolling.update([2.0, np.nan, 4.0]), [2.0, 2.0, 3.0])
+        np.testing.assert_allclose(rolling.update(np.nan), [3.0])
+    
+    def test_rolling_weighted_mean(self):
+        weights = np.arange(1, self.window + 1)
+        windows = np.lib.stride_tricks.sliding_window_view(self.data, self.window)
+        np.testing.assert_allclose(self._feed(RollingWeightedMean(self.window)), windows @ weights / weights.sum())
+    
+    def test_rolling_median(self):
+        windows = np.lib.stride_tricks.sliding_window_view(self.data, self.window)
+        np.testing.assert_allclose(self._feed(RollingMedian(self.window)), np.median(windows, axis=1))
+        windows = np.lib.stride_tricks.sliding_window_view(self.data, 4)
+        np.testing.assert_allclose(self._feed(RollingMedian(4)), np.median(windows, axis=1))
+    
+    def test_single_samples_match_batch_with_nan(self):
+        data = np.array([1.0, 2.0, 3.0, np.nan, 4.0, 5.0, 6.0, 7.0, np.inf, 8.0, 9.0, 10.0, 11.0])
+        for cls in (RollingMean, RollingWeightedMean):
+            batch = cls(3).update(data)
+            rolling = cls(3)
+            single = np.concatenate([rolling.update(value) for value in data])
+            np.testing.assert_allclose(single, batch)
+    
+    def test_rolling_median_nan(self):
+        data = np.array([1.0, np.nan, 3.0, 2.0, 5.0, 4.0])
+        windows = np.lib.stride_tricks.sliding_window_view(data, 3)
+        rolling = RollingMedian(3)
+        result = np.concatenate([rolling.update(value) for value in data])
+        np.testing.assert_allclose(result, np.median(windows, axis=1))
+    
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            RollingMean(0)
+        with self.assertRaises(ValueError):
+            RollingEMA()
+        with self.assertRaises(ValueError):
+            RollingEMA(alpha=1.5)
+        with self.assertRaises(ValueError):
+            RollingEMA(window=-1)
+
+
+class TestQuantileSketch(unittest.TestCase):
+    
+    def setUp(self):
+        self.data = np.random.default_rng(0).normal(size=100_000)
+        self.quantiles = np.array([0.01, 0.25, 0.5, 0.75, 0.99])
+    
+    def _max_rank_error(self, sketch):
+        estimates = sketch.quantile(self.quantiles)
+        ranks = np.searchsorted(np.sort(self.data), estimates) / len(self.data)
+        return np.max(np.abs(ranks - self.quantiles))
+    
+    def test_exact_for_small_input(self):
+        sketch = QuantileSketch(k=200).update([4, 1, 3, 2])
+        self.assertTrue(sketch.is_exact)
+        self.assertEqual(sketch.quantile(0.5), 2.5)
+        self.assertEqual(sketch.median_absolute_deviation(), 1.0)
+    
+    def test_error_bound_in_chunks(self):
+        sketch = QuantileSketch(k=200, random_state=0)
+        for chunk in np.array_split(self.data, 30):
+            sketch.update(chunk)
+        self.assertEqual(sketch.count, len(self.data))
+        self.assertLess(self._max_rank_error(sketch), sketch.rank_error)
+        self.assertEqual(sketch.quantile(0.0), self.data.min())
+        self.assertEqual(sketch.quantile(1.0), self.data.max())
+    
+    def test_merge(self):
+        shards = [QuantileSketch(k=200, random_state=i).update(part)
+                  for i, part in enumerate(np.array_split(self.data, 4))]
+        merged = shards[0]
+        for shard in shards[1:]:
+            merged.merge(shard)
+        self.assertEqual(merged.count, len(self.data))
+        self.assertLess(self._max_rank_error(merged), merged.rank_error)
+    
+    def test_ignores_nan_and_rejects_empty(self):
+        sketch = QuantileSketch().update([np.nan, np.nan])
+        with self.assertRaises(ValueError):
+            sketch.quantile(0.5)
+    
+    def test_invalid_k(self):
+        with self.assertRaises(ValueError):
+            QuantileSketch(k=2)
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)
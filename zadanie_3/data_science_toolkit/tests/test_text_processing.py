@@ -1,13 +1,17 @@
 import unittest
 import sys
+import tempfile
+from itertools import islice
 from pathlib import Path
 
+import numpy as np
+
 project_root = Path(__file__).parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 from data_science_toolkit.text_processing import (
-    TextAnalyzer, clean_text, extract_keywords, text_similarity
+    TextAnalyzer, CorpusIndex, clean_text, extract_keywords, text_similarity
 )
 
 
@@ -45,6 +49,28 @@ class TestTextAnalyzer(unittest.TestCase):
         self.assertIsInstance(result, str)
         self.assertEqual(result, '123')
     
+    def test_preprocess_batch_matches_single(self):
+        texts = [self.sample_text, self.polish_text, "Liczby 12 i ٣ oraz\tznaki\u00a0specjalne!", 42]
+        for remove_numbers in (False, True):
+            expected = [self.analyzer.preprocess_text(text, remove_numbers=remove_numbers) for text in texts]
+            self.assertEqual(self.analyzer.preprocess_batch(texts, remove_numbers=remove_numbers), expected)
+        self.assertEqual(self.analyzer.preprocess_text("Liczby 12 i ٣", remove_numbers=True), 'liczby i')
+    
+    def test_preprocess_stream_is_lazy(self):
+        def endless():
+            while True:
+                yield "Tekst, Do Przetworzenia!"
+        
+        stream = self.analyzer.preprocess_stream(endless())
+        self.assertEqual(list(islice(stream, 3)), ['tekst do przetworzenia'] * 3)
+    
+    def test_preprocess_batch_process_pool(self):
+        texts = [f"Dokument {i}: {self.sample_text}" for i in range(250)]
+        expected = [self.analyzer.preprocess_text(text) for text in texts]
+        self.assertEqual(self.analyzer.preprocess_batch(texts, n_jobs=2, chunksize=40), expected)
+        with self.assertRaises(ValueError):
+            self.analyzer.preprocess_batch(texts, chunksize=0)
+    
     def test_extract_features_basic(self):
         features = self.analyzer.extract_features(self.sample_text)
         self.assertIsInstance(features, dict)
@@ -85,6 +111,22 @@ class TestCleanText(unittest.TestCase):
         self.assertNotIn('123', result)
         self.assertNotIn('é', result)
     
+    def test_clean_text_exact_output(self):
+        self.assertEqual(clean_text("abchttp://x.pl/y, @ala#kot ma_kota!"), 'abc ma_kota')
+        self.assertEqual(clean_text("wynik: 3.14 (ok)"), 'wynik 3 14 ok')
+        self.assertEqual(clean_text("Zażółć gęślą 12 jaźń @ktoś x", aggressive=True), 'Za gl ja x')
+        # Białe znaki spoza ASCII znikają w trybie agresywnym i sklejają sąsiednie słowa
+        self.assertEqual(clean_text("ab\u2003@x\u2003cd ef", aggressive=True), 'abcd ef')
+        self.assertEqual(clean_text("ab\u2003cd ef"), 'ab\u2003cd ef'.replace('\u2003', ' '))
+    
+    def test_clean_text_return_tokens(self):
+        text = "Sprawdź https://example.com, @ktoś i 42 słowa!"
+        for aggressive in (False, True):
+            tokens = clean_text(text, aggressive=aggressive, return_tokens=True)
+            self.assertIsInstance(tokens, list)
+            self.assertEqual(tokens, clean_text(text, aggressive=aggressive).split())
+        self.assertEqual(clean_text("", return_tokens=True), [])
+    
     def test_clean_text_non_string_input(self):
         result = clean_text(123)
         self.assertIsInstance(result, str)
@@ -168,5 +210,85 @@ class TestTextSimilarity(unittest.TestCase):
         self.assertEqual(similarity, 1.0)
 
 
+class TestCorpusIndex(unittest.TestCase):
+    
+    def setUp(self):
+        self.documents = [
+            "Python jest świetny do analizy danych",
+            "Analiza danych w Pythonie",
+            "Kot siedzi na macie",
+            "Python i dane, dane, dane!"
+        ]
+        self.index = CorpusIndex()
+        self.index.add_documents(self.documents)
+    
+    def test_postings_and_document_frequency(self):
+        np.testing.assert_array_equal(self.index.documents('danych'), [0, 1])
+        docs, freqs = self.index.postings('dane')
+        np.testing.assert_array_equal(docs, [3])
+        np.testing.assert_array_equal(freqs, [3])
+        self.assertEqual(self.index.document_frequency('python'), 2)
+        self.assertEqual(self.index.document_frequency('brak'), 0)
+        self.assertEqual(len(self.index.documents('brak')), 0)
+    
+    def test_search(self):
+        np.testing.assert_array_equal(self.index.search('python danych'), [0])
+        np.testing.assert_array_equal(self.index.search('python kot', mode='any'), [0, 2, 3])
+        with self.assertRaises(ValueError):
+            self.index.search('python', mode='żaden')
+    
+    def test_similar_matches_text_similarity(self):
+        query = "python danych analizy"
+        for method in ('jaccard', 'cosine'):
+            expected = {doc_id: text_similarity(query, text, method=method)
+                        for doc_id, text in enumerate(self.documents)}
+            for doc_id, score in self.index.similar(query, method=method):
+                self.assertAlmostEqual(score, expected[doc_id])
+        self.assertEqual(self.index.similar(query, top_n=1)[0][0], 0)
+    
+    def test_remove_document(self):
+        self.index.remove_document(0)
+        np.testing.assert_array_equal(self.index.documents('python'), [3])
+        self.assertEqual(self.index.document_frequency('python'), 1)
+        self.assertEqual(self.index.n_documents, 3)
+        with self.assertRaises(ValueError):
+            self.index.remove_document(0)
+        self.index.compact()
+        np.testing.assert_array_equal(self.index.documents('python'), [3])
+        self.assertEqual(dict(self.index.most_common_terms())['danych'], 1)
+    
+    def test_save_and_load_with_mmap(self):
+        self.index.remove_document(2)
+        with tempfile.TemporaryDirectory() as path:
+            self.index.save(path)
+            loaded = CorpusIndex.load(path)
+            self.assertIsInstance(loaded._postings_docs, np.memmap)
+            self.assertEqual(loaded.n_documents, 3)
+            self.assertEqual(loaded.most_common_terms(), self.index.most_common_terms())
+            np.testing.assert_array_equal(loaded.documents('kot'), [])
+            
+            doc_id = loaded.add_document("Python kot")
+            self.assertEqual(doc_id, 4)
+            np.testing.assert_array_equal(loaded.documents('python'), [0, 3, 4])
+            loaded.remove_document(0)
+            self.assertEqual(loaded.document_frequency('python'), 2)
+            del loaded
+    
+    def test_text_analyzer_integration(self):
+        analyzer = TextAnalyzer()
+        doc_ids = analyzer.index_documents(self.documents)
+        self.assertEqual(doc_ids, [0, 1, 2, 3])
+        self.assertEqual(len(analyzer.processed_texts), 4)
+        # Słowa z listy stop words nie trafiają do indeksu
+        self.assertEqual(analyzer.index.document_frequency('na'), 0)
+        self.assertEqual(analyzer.find_similar("analiza danych")[0][0], 1)
+    
+    def test_diacritic_stop_words_not_indexed(self):
+        analyzer = TextAnalyzer()
+        analyzer.index_documents(['kot się bawi', 'pies się bawi', 'się się się'])
+        self.assertNotIn(analyzer.preprocess_text('się'), dict(analyzer.index.most_common_terms()))
+        self.assertEqual(analyzer.find_similar('się'), [])
+
+
 if __name__ == '__main__':
     unittest.main(verbosity=2)